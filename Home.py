@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 from streamlit_extras.app_logo import add_logo
 
+from recursos import mostrar_foto
+
 # Configuração da página
 st.set_page_config(page_title="Currículo", layout="wide")
 st.sidebar.markdown("Feito por Felipe Megumi Nakama")
@@ -11,7 +13,7 @@ st.sidebar.markdown("Feito por Felipe Megumi Nakama")
 # st.logo("")
 
 # Adicionando a foto
-st.image("foto.jpg", width=100)
+mostrar_foto()
 
 st.title("Felipe Megumi Nakama")
 
@@ -0,0 +1 @@
+# Módulos de apoio da página de Análise de Vendas de Videogames
@@ -0,0 +1,232 @@
+"""Pré-cálculo de todos os artefatos da página de Análise.
+
+Tudo o que as seções 2 e 3 exibem é função determinística do dataset, então
+pode ser calculado fora das requisições, em paralelo, e gravado em
+.cache/artefatos/<versão>/. A página só carrega esses arquivos e cai no
+cálculo sob demanda quando algum deles não existe.
+
+    python -m analise.artefatos
+    python -m analise.artefatos --processos 4
+"""
+
+import argparse
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from analise.dados import CACHE_DIR, VENDAS, dataset_version, escrever_atomico
+
+ARTEFATOS_DIR = CACHE_DIR / "artefatos"
+
+# Mesma grade do slider da Análise Binomial (0.1 a 2.0, passo 0.01)
+LIMIARES = np.round(np.arange(0.1, 2.0 + 1e-9, 0.01), 2)
+
+
+def pasta_artefatos(versao):
+    base, _, lotes = versao.partition("+")
+    return ARTEFATOS_DIR / f"{base[:16]}_{lotes or 0}"
+
+
+def carimbo_artefato(versao, nome):
+    """mtime do artefato (None se ainda não existe), para entrar na chave de caches."""
+    try:
+        return (pasta_artefatos(versao) / f"{nome}.pkl").stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def carregar_artefato(versao, nome):
+    caminho = pasta_artefatos(versao) / f"{nome}.pkl"
+    try:
+        with open(caminho, "rb") as arquivo:
+            return pickle.load(arquivo)
+    except FileNotFoundError:
+        return None
+
+
+def ler_figura(chave):
+    # chave = (tipo do gráfico, região/gênero, versão[, filtro]), igual à do
+    # cache de figuras; gráficos filtrados não são pré-renderizados
+    tipo, parametro, versao, *filtro = chave
+    if any(f.ativo() for f in filtro):
+        return None
+    caminho = pasta_artefatos(versao) / "figuras" / f"{tipo}__{parametro}.png"
+    try:
+        return caminho.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _salvar(pasta, nome, objeto):
+    escrever_atomico(pasta / f"{nome}.pkl", lambda p: p.write_bytes(pickle.dumps(objeto)))
+
+
+def salvar_artefato(versao, nome, objeto):
+    pasta = pasta_artefatos(versao)
+    pasta.mkdir(parents=True, exist_ok=True)
+    _salvar(pasta, nome, objeto)
+
+
+# Cada processo do pool carrega o dataset (mapeado em memória) uma vez
+_df = None
+
+
+def _iniciar_worker():
+    global _df
+    from analise.ingestao import dataset_completo
+
+    _df = dataset_completo()
+
+
+def _cubo():
+    from analise.backends import PandasBackend
+    from analise.cubo import build_cubo
+
+    return build_cubo(PandasBackend(_df))
+
+
+def _tarefa_cubo(pasta):
+    _salvar(pasta, "cubo", _cubo())
+
+
+def _tarefa_normalidade(pasta, regiao):
+    from analise.normalidade import build_normalidade
+
+    _salvar(pasta, f"normalidade_{regiao}", build_normalidade(_df, regioes=[regiao]))
+
+
+def _tarefa_binomial(pasta, indice, limiares):
+    from analise.binomial import contar_sucessos, ordenar_por_grupo, tabela_binomial
+
+    ordenadas = ordenar_por_grupo(_df, "Genre", "Global_Sales")
+    tabelas = [
+        tabela_binomial(ordenadas.grupos, ordenadas.tamanhos, contar_sucessos(ordenadas, limiar)).assign(Limiar=limiar)
+        for limiar in limiares
+    ]
+    _salvar(pasta, f"binomial_{indice:03d}", pd.concat(tabelas, ignore_index=True))
+
+
+def _tarefa_bootstrap(pasta, dimensao, indice, grupos):
+    from analise.bootstrap import build_bootstrap
+
+    parte = build_bootstrap(_df, dimensoes=[dimensao], so_grupos=set(grupos))
+    _salvar(pasta, f"bootstrap_{dimensao}_{indice:03d}", parte)
+
+
+def _tarefa_rollup(pasta):
+    from analise.tendencias import build_rollup
+
+    _salvar(pasta, "rollup", build_rollup(_df))
+
+
+def _tarefa_figuras(pasta, tipo, parametros):
+    from analise import graficos
+    from analise.cubo import tabela_plataformas
+    from analise.normalidade import testar_normalidade
+
+    destino = pasta / "figuras"
+    destino.mkdir(exist_ok=True)
+    for parametro in parametros:
+        if tipo == "top_plataformas":
+            fig = graficos.grafico_top_plataformas(tabela_plataformas(_cubo()).head(10))
+        elif tipo == "distribuicao_regiao":
+            fig = graficos.grafico_distribuicao_regiao(_df.loc[_df[parametro] < 1, parametro] * 1_000_000)
+        elif tipo == "normal_genero":
+            vendas = _df.loc[_df["Genre"] == parametro, "Global_Sales"]
+            fig = graficos.grafico_normal_genero(vendas[vendas < 5], parametro)
+        else:
+            vendas = _df.loc[_df["Genre"] == parametro, "Global_Sales"].to_numpy()
+            _, pontos = testar_normalidade(vendas, np.random.default_rng(0))
+            fig = graficos.grafico_qq(pontos, parametro)
+        png = graficos.figura_para_png(fig)
+        escrever_atomico(destino / f"{tipo}__{parametro}.png", lambda p: p.write_bytes(png))
+
+
+def _tarefas(pasta, grupos, processos):
+    generos = grupos["Genre"]
+    tarefas = [(_tarefa_cubo, pasta), (_tarefa_rollup, pasta)]
+    tarefas += [(_tarefa_normalidade, pasta, regiao) for regiao in VENDAS]
+    # Bootstrap dividido por grupos de cada dimensão, como a grade binomial por limiares
+    for dimensao, valores in grupos.items():
+        for indice, parte in enumerate(np.array_split(np.array(valores, dtype=object), processos)):
+            if len(parte):
+                tarefas.append((_tarefa_bootstrap, pasta, dimensao, indice, parte.tolist()))
+    for indice, limiares in enumerate(np.array_split(LIMIARES, processos)):
+        tarefas.append((_tarefa_binomial, pasta, indice, limiares.tolist()))
+    tarefas.append((_tarefa_figuras, pasta, "top_plataformas", ["Global_Sales"]))
+    tarefas.append((_tarefa_figuras, pasta, "distribuicao_regiao", VENDAS))
+    tarefas += [(_tarefa_figuras, pasta, "normal_genero", [g]) for g in generos]
+    tarefas += [(_tarefa_figuras, pasta, "qq_genero", [g]) for g in generos]
+    return tarefas
+
+
+def construir(versao, processos=None):
+    """Calcula todos os artefatos da versão em um pool de processos."""
+    from analise.bootstrap import DIMENSOES
+    from analise.ingestao import dataset_completo
+
+    processos = processos or os.cpu_count() or 1
+    pasta = pasta_artefatos(versao)
+    pasta.mkdir(parents=True, exist_ok=True)
+    df = dataset_completo()
+    grupos = {dimensao: sorted(df[dimensao].dropna().unique().tolist()) for dimensao in DIMENSOES}
+    del df
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker) as pool:
+        futuros = [pool.submit(*tarefa) for tarefa in _tarefas(pasta, grupos, processos)]
+        for futuro in as_completed(futuros):
+            futuro.result()
+
+    # Junta as partes calculadas em paralelo num artefato por tipo
+    partes_binomial = sorted(pasta.glob("binomial_*.pkl"))
+    grade = pd.concat([pickle.loads(p.read_bytes()) for p in partes_binomial], ignore_index=True)
+    _salvar(pasta, "binomial", grade)
+
+    tabelas, qq = [], {}
+    for regiao in VENDAS:
+        parte = pasta / f"normalidade_{regiao}.pkl"
+        tabela, pontos = pickle.loads(parte.read_bytes())
+        tabelas.append(tabela)
+        qq.update(pontos)
+    _salvar(pasta, "normalidade", (pd.concat(tabelas), qq))
+
+    # Partes do bootstrap em ordem de dimensão (Genre, Platform) e de grupo
+    partes_bootstrap = sorted(pasta.glob("bootstrap_*.pkl"))
+    _salvar(pasta, "bootstrap", pd.concat([pickle.loads(p.read_bytes()) for p in partes_bootstrap]))
+
+    for parte in [*partes_binomial, *partes_bootstrap, *(pasta / f"normalidade_{r}.pkl" for r in VENDAS)]:
+        parte.unlink()
+
+    manifesto = {
+        "versao": versao,
+        "processos": processos,
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "artefatos": sorted(str(p.relative_to(pasta)) for p in pasta.rglob("*") if p.is_file()),
+    }
+    escrever_atomico(pasta / "manifesto.json",
+                     lambda p: p.write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding="utf-8"))
+    return manifesto
+
+
+def main():
+    from analise.ingestao import listar_deltas, versao_completa
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processos", type=int, default=None, help="padrão: número de CPUs")
+    args = parser.parse_args()
+
+    versao_base = dataset_version()
+    versao = versao_completa(versao_base, listar_deltas(versao_base))
+    manifesto = construir(versao, args.processos)
+    print(f"{len(manifesto['artefatos'])} artefatos em {manifesto['segundos']}s "
+          f"com {manifesto['processos']} processos -> {pasta_artefatos(versao)}")
+
+
+if __name__ == "__main__":
+    main()
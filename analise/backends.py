@@ -0,0 +1,248 @@
+"""Backends de consulta do dataset de vendas.
+
+A página só pede resultados pequenos (agregados por célula, contagens de
+sucesso, valores filtrados para gráficos); cada backend decide como
+calculá-los. O backend é escolhido pela variável de ambiente
+ANALISE_ENGINE: "pandas" (padrão), "duckdb" ou "polars".
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from analise.binomial import contar_sucessos, ordenar_por_grupo
+from analise.dados import VENDAS
+
+ENGINE_PADRAO = "pandas"
+QUANTIS = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+def engine_configurada():
+    return os.environ.get("ANALISE_ENGINE", ENGINE_PADRAO).lower()
+
+
+def _lista(caminhos):
+    # Aceita um caminho só (dataset base) ou base + arquivos de ingestão
+    return caminhos if isinstance(caminhos, (list, tuple)) else [caminhos]
+
+
+def _montar_resumo(linhas):
+    # linhas: {região: {estatística: valor}} -> mesmo formato do describe()
+    ordem = ["count", "mean", "std", "min", "25%", "50%", "75%", "max", "mode", "var"]
+    return pd.DataFrame(linhas).loc[ordem, VENDAS]
+
+
+def celulas_de(df):
+    # Contagem, soma e soma dos quadrados de cada região por (Platform, Genre)
+    vendas = df[VENDAS].astype("float64")
+    chaves = [df["Platform"], df["Genre"]]
+    grupos = vendas.groupby(chaves, observed=True)
+    somas = grupos.sum().add_suffix("_sum")
+    quadrados = (vendas ** 2).groupby(chaves, observed=True).sum().add_suffix("_sumsq")
+    contagem = grupos.size().rename("count")
+    celulas = pd.concat([contagem, somas, quadrados], axis=1)
+    # Índice em texto, igual ao dos outros backends e fácil de somar entre lotes
+    celulas.index = celulas.index.set_levels([nivel.astype(str) for nivel in celulas.index.levels])
+    return celulas
+
+
+class PandasBackend:
+    """Tudo em memória com pandas; bom para o CSV de 16 mil linhas."""
+
+    nome = "pandas"
+
+    def __init__(self, df, ordenadas=None):
+        self.df = df
+        if ordenadas is None:
+            ordenadas = ordenar_por_grupo(df, "Genre", "Global_Sales")
+        self._ordenadas = ordenadas
+
+    def grupos(self, dimensao):
+        return sorted(self.df[dimensao].dropna().unique().tolist())
+
+    def celulas(self):
+        return celulas_de(self.df)
+
+    def resumo(self):
+        vendas = self.df[VENDAS].astype("float64")
+        resumo = vendas.describe()
+        resumo.loc["mode"] = vendas.mode().iloc[0]
+        resumo.loc["var"] = vendas.var()
+        return resumo
+
+    def correlacao(self):
+        return self.df[VENDAS].astype("float64").corr()
+
+    def contar_sucessos(self, limiar):
+        # Retorna (gêneros, total de jogos, jogos com Global_Sales >= limiar)
+        ordenadas = self._ordenadas
+        return ordenadas.grupos, ordenadas.tamanhos, contar_sucessos(ordenadas, limiar)
+
+    def valores(self, coluna, genero=None, abaixo_de=None):
+        mascara = np.ones(len(self.df), dtype=bool)
+        if genero is not None:
+            mascara &= (self.df["Genre"] == genero).to_numpy()
+        if abaixo_de is not None:
+            mascara &= (self.df[coluna] < abaixo_de).to_numpy()
+        return self.df.loc[mascara, coluna]
+
+
+class DuckDBBackend:
+    """Consultas SQL do DuckDB direto sobre os arquivos Parquet."""
+
+    nome = "duckdb"
+
+    def __init__(self, parquet_paths):
+        import duckdb
+
+        caminhos = ", ".join("'" + str(p).replace("'", "''") + "'" for p in _lista(parquet_paths))
+        self.con = duckdb.connect()
+        self.con.execute(f"CREATE VIEW vendas AS SELECT * FROM read_parquet([{caminhos}])")
+
+    def _df(self, sql, params=None):
+        # O backend é compartilhado entre sessões e uma conexão DuckDB não
+        # aceita consultas de várias threads; cada consulta usa um cursor próprio
+        with self.con.cursor() as cursor:
+            return cursor.execute(sql, params or []).df()
+
+    def grupos(self, dimensao):
+        sql = f'SELECT DISTINCT "{dimensao}" FROM vendas WHERE "{dimensao}" IS NOT NULL ORDER BY 1'
+        return self._df(sql)[dimensao].tolist()
+
+    def celulas(self):
+        colunas = ", ".join(
+            [f'sum("{r}"::DOUBLE) AS "{r}_sum"' for r in VENDAS]
+            + [f'sum("{r}"::DOUBLE * "{r}"::DOUBLE) AS "{r}_sumsq"' for r in VENDAS]
+        )
+        sql = f'SELECT Platform, Genre, count(*) AS count, {colunas} FROM vendas GROUP BY Platform, Genre'
+        return self._df(sql).set_index(["Platform", "Genre"]).sort_index()
+
+    def resumo(self):
+        linhas = {}
+        for r in VENDAS:
+            x = f'"{r}"::DOUBLE'
+            estatisticas = self._df(f"""
+                SELECT count({x}) AS "count", avg({x}) AS "mean", stddev_samp({x}) AS "std",
+                       min({x}) AS "min", quantile_cont({x}, 0.25) AS "25%",
+                       quantile_cont({x}, 0.5) AS "50%", quantile_cont({x}, 0.75) AS "75%",
+                       max({x}) AS "max", var_samp({x}) AS "var"
+                FROM vendas
+            """).iloc[0].to_dict()
+            # Moda igual à do pandas: o menor dos valores mais frequentes
+            estatisticas["mode"] = self._df(
+                f'SELECT "{r}" AS v FROM vendas GROUP BY 1 ORDER BY count(*) DESC, 1 LIMIT 1'
+            )["v"].iloc[0]
+            linhas[r] = estatisticas
+        return _montar_resumo(linhas)
+
+    def correlacao(self):
+        pares = ", ".join(f'corr("{a}", "{b}") AS "{a}|{b}"' for a in VENDAS for b in VENDAS)
+        valores = self._df(f"SELECT {pares} FROM vendas").iloc[0].to_numpy()
+        return pd.DataFrame(valores.reshape(len(VENDAS), len(VENDAS)), index=VENDAS, columns=VENDAS)
+
+    def contar_sucessos(self, limiar):
+        # O limiar vira FLOAT para comparar como a coluna float32 do pandas
+        resultado = self._df("""
+            SELECT Genre, count(*) AS n, count(*) FILTER (WHERE Global_Sales >= ?::FLOAT) AS k
+            FROM vendas GROUP BY Genre ORDER BY Genre
+        """, [limiar])
+        return resultado["Genre"].to_numpy(), resultado["n"].to_numpy(), resultado["k"].to_numpy()
+
+    def valores(self, coluna, genero=None, abaixo_de=None):
+        condicoes, params = [], []
+        if genero is not None:
+            condicoes.append("Genre = ?")
+            params.append(genero)
+        if abaixo_de is not None:
+            condicoes.append(f'"{coluna}" < ?::FLOAT')
+            params.append(abaixo_de)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return self._df(f'SELECT "{coluna}" FROM vendas {where}', params)[coluna]
+
+
+class PolarsBackend:
+    """Consultas preguiçosas (LazyFrame) do Polars sobre os arquivos Parquet."""
+
+    nome = "polars"
+
+    def __init__(self, parquet_paths):
+        import polars as pl
+
+        self.pl = pl
+        self.lf = pl.scan_parquet([str(p) for p in _lista(parquet_paths)]).with_columns(
+            pl.col("Platform", "Genre", "Publisher").cast(pl.String)
+        )
+
+    def grupos(self, dimensao):
+        pl = self.pl
+        coluna = self.lf.select(pl.col(dimensao).drop_nulls().unique().sort()).collect()
+        return coluna[dimensao].to_list()
+
+    def celulas(self):
+        pl = self.pl
+        agregados = [pl.len().alias("count")]
+        agregados += [pl.col(r).cast(pl.Float64).sum().alias(f"{r}_sum") for r in VENDAS]
+        agregados += [(pl.col(r).cast(pl.Float64) ** 2).sum().alias(f"{r}_sumsq") for r in VENDAS]
+        resultado = self.lf.group_by("Platform", "Genre").agg(agregados).collect()
+        return resultado.to_pandas().set_index(["Platform", "Genre"]).sort_index()
+
+    def resumo(self):
+        pl = self.pl
+        expressoes = []
+        for r in VENDAS:
+            x = pl.col(r).cast(pl.Float64)
+            expressoes += [
+                x.count().cast(pl.Float64).alias(f"{r}|count"),
+                x.mean().alias(f"{r}|mean"),
+                x.std().alias(f"{r}|std"),
+                x.min().alias(f"{r}|min"),
+                *[x.quantile(q, "linear").alias(f"{r}|{nome}") for nome, q in QUANTIS.items()],
+                x.max().alias(f"{r}|max"),
+                x.mode().min().alias(f"{r}|mode"),
+                x.var().alias(f"{r}|var"),
+            ]
+        linha = self.lf.select(expressoes).collect().row(0, named=True)
+        linhas = {}
+        for chave, valor in linha.items():
+            regiao, estatistica = chave.split("|")
+            linhas.setdefault(regiao, {})[estatistica] = valor
+        return _montar_resumo(linhas)
+
+    def correlacao(self):
+        pl = self.pl
+        pares = [pl.corr(a, b).alias(f"{a}|{b}") for a in VENDAS for b in VENDAS]
+        valores = np.array(self.lf.select(pares).collect().row(0))
+        return pd.DataFrame(valores.reshape(len(VENDAS), len(VENDAS)), index=VENDAS, columns=VENDAS)
+
+    def contar_sucessos(self, limiar):
+        pl = self.pl
+        resultado = (
+            self.lf.group_by("Genre")
+            .agg(
+                pl.len().alias("n"),
+                (pl.col("Global_Sales") >= pl.lit(limiar, dtype=pl.Float32)).sum().alias("k"),
+            )
+            .sort("Genre")
+            .collect()
+        )
+        return resultado["Genre"].to_numpy(), resultado["n"].to_numpy(), resultado["k"].to_numpy()
+
+    def valores(self, coluna, genero=None, abaixo_de=None):
+        pl = self.pl
+        consulta = self.lf
+        if genero is not None:
+            consulta = consulta.filter(pl.col("Genre") == genero)
+        if abaixo_de is not None:
+            consulta = consulta.filter(pl.col(coluna) < pl.lit(abaixo_de, dtype=pl.Float32))
+        return consulta.select(coluna).collect()[coluna].to_pandas()
+
+
+def criar_backend(engine, df=None, parquet_path=None, ordenadas=None):
+    if engine == "pandas":
+        return PandasBackend(df, ordenadas)
+    if engine == "duckdb":
+        return DuckDBBackend(parquet_path)
+    if engine == "polars":
+        return PolarsBackend(parquet_path)
+    raise ValueError(f"Engine desconhecida: {engine!r} (use pandas, duckdb ou polars)")
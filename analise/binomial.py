@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# z do intervalo de confiança de 95%, calculado uma única vez
+Z_95 = NormalDist().inv_cdf(0.975)
+
+
+@dataclass
+class VendasOrdenadas:
+    """Vendas de cada grupo ordenadas uma vez, em um único array contíguo.
+
+    O grupo i ocupa valores[inicios[i]:inicios[i] + tamanhos[i]].
+    """
+
+    grupos: np.ndarray
+    valores: np.ndarray
+    inicios: np.ndarray
+    tamanhos: np.ndarray
+
+
+def ordenar_por_grupo(df, grupo="Genre", coluna="Global_Sales"):
+    codigos = df[grupo].cat.codes.to_numpy()
+    valores = df[coluna].to_numpy(dtype="float32")
+    # Ordena por grupo e, dentro do grupo, por vendas
+    ordem = np.lexsort((valores, codigos))
+    codigos, valores = codigos[ordem], valores[ordem]
+
+    presentes, inicios, tamanhos = np.unique(codigos, return_index=True, return_counts=True)
+    grupos = df[grupo].cat.categories.to_numpy()[presentes]
+    return VendasOrdenadas(grupos=grupos, valores=valores, inicios=inicios, tamanhos=tamanhos)
+
+
+def mesclar_vendas(ordenadas, grupos_novos, valores_novos):
+    """Insere novas vendas nos arrays já ordenados, sem reordenar tudo."""
+    segmentos = {
+        grupo: ordenadas.valores[i:i + n]
+        for grupo, i, n in zip(ordenadas.grupos, ordenadas.inicios, ordenadas.tamanhos)
+    }
+    grupos_novos = np.asarray(grupos_novos, dtype=object)
+    valores_novos = np.asarray(valores_novos, dtype="float32")
+    for grupo in np.unique(grupos_novos):
+        novos = np.sort(valores_novos[grupos_novos == grupo])
+        atual = segmentos.get(grupo, np.empty(0, dtype="float32"))
+        segmentos[grupo] = np.insert(atual, np.searchsorted(atual, novos, side="right"), novos)
+
+    grupos = sorted(segmentos)
+    tamanhos = np.array([len(segmentos[g]) for g in grupos])
+    inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+    return VendasOrdenadas(
+        grupos=np.array(grupos, dtype=object),
+        valores=np.concatenate([segmentos[g] for g in grupos]),
+        inicios=inicios,
+        tamanhos=tamanhos,
+    )
+
+
+def contar_sucessos(ordenadas, limiar):
+    # Jogos com vendas >= limiar: uma busca binária por grupo
+    limiar = np.float32(limiar)
+    abaixo = np.array([
+        np.searchsorted(ordenadas.valores[i:i + n], limiar, side="left")
+        for i, n in zip(ordenadas.inicios, ordenadas.tamanhos)
+    ])
+    return ordenadas.tamanhos - abaixo
+
+
+def intervalo_wald(k, n, z=Z_95):
+    p = k / n
+    margem = z * np.sqrt(p * (1 - p) / n)
+    return np.clip(p - margem, 0, 1), np.clip(p + margem, 0, 1)
+
+
+def intervalo_wilson(k, n, z=Z_95):
+    p = k / n
+    z2 = z ** 2
+    centro = (p + z2 / (2 * n)) / (1 + z2 / n)
+    margem = z * np.sqrt(p * (1 - p) / n + z2 / (4 * n ** 2)) / (1 + z2 / n)
+    return np.clip(centro - margem, 0, 1), np.clip(centro + margem, 0, 1)
+
+
+def tabela_binomial(grupos, tamanhos, sucessos):
+    n = np.asarray(tamanhos, dtype="float64")
+    k = np.asarray(sucessos, dtype="float64")
+    p = k / n
+    wald_inf, wald_sup = intervalo_wald(k, n)
+    wilson_inf, wilson_sup = intervalo_wilson(k, n)
+    return pd.DataFrame({
+        "Gênero": grupos,
+        "Probabilidade (%)": np.round(p * 100, 1),
+        "IC Inferior (%)": np.round(wald_inf * 100, 1),
+        "IC Superior (%)": np.round(wald_sup * 100, 1),
+        "IC Wilson Inferior (%)": np.round(wilson_inf * 100, 1),
+        "IC Wilson Superior (%)": np.round(wilson_sup * 100, 1),
+        "Total de Jogos": np.asarray(tamanhos),
+    })
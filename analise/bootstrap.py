@@ -0,0 +1,160 @@
+"""Intervalos de confiança bootstrap por gênero e por plataforma.
+
+Para cada grupo, as reamostras são geradas em blocos como uma matriz de
+índices (reamostras x jogos) e todas as estatísticas do bloco saem de
+operações vetorizadas sobre essa matriz. Os blocos são independentes (cada
+um tem a própria semente), então podem rodar num pool de processos e o
+resultado é o mesmo com qualquer número de processos.
+
+    python -m analise.bootstrap --processos 4   # grava o artefato bootstrap.pkl
+"""
+
+import argparse
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from analise.dados import VENDAS
+
+N_REAMOSTRAS = 2000
+TAMANHO_BLOCO = 250
+LIMIAR_SUCESSO = 0.5
+NIVEL = 0.95
+DIMENSOES = {"Genre": "Gênero", "Platform": "Plataforma"}
+
+REGIOES = [r for r in VENDAS if r != "Global_Sales"]
+ESTATISTICAS = ["Média", "Mediana", f"P(Vendas ≥ {LIMIAR_SUCESSO}M)"] + [
+    f"Correlação {r.replace('_Sales', '')} x Global" for r in REGIOES
+]
+
+
+def _correlacao(x, y):
+    # Correlação de Pearson linha a linha (uma por reamostra)
+    x = x - x.mean(axis=-1, keepdims=True)
+    y = y - y.mean(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (x * y).sum(axis=-1) / np.sqrt((x * x).sum(axis=-1) * (y * y).sum(axis=-1))
+
+
+def estatisticas_de(vendas):
+    """Estatísticas de uma matriz (..., jogos, regiões em VENDAS)."""
+    globais = vendas[..., VENDAS.index("Global_Sales")]
+    valores = [
+        globais.mean(axis=-1),
+        np.median(globais, axis=-1),
+        (globais >= LIMIAR_SUCESSO).mean(axis=-1),
+    ]
+    valores += [_correlacao(vendas[..., VENDAS.index(r)], globais) for r in REGIOES]
+    return np.stack(valores, axis=-1)
+
+
+def _bloco(vendas, semente, tamanho):
+    rng = np.random.default_rng(semente)
+    indices = rng.integers(0, len(vendas), size=(tamanho, len(vendas)))
+    # Uma região por vez para a matriz reamostrada não crescer 5x
+    globais = vendas[:, VENDAS.index("Global_Sales")][indices]
+    resultado = np.empty((tamanho, len(ESTATISTICAS)))
+    resultado[:, 0] = globais.mean(axis=1)
+    resultado[:, 1] = np.median(globais, axis=1)
+    resultado[:, 2] = (globais >= LIMIAR_SUCESSO).mean(axis=1)
+    for j, regiao in enumerate(REGIOES, start=3):
+        resultado[:, j] = _correlacao(vendas[:, VENDAS.index(regiao)][indices], globais)
+    return resultado
+
+
+def _blocos(n_reamostras):
+    inteiros, resto = divmod(n_reamostras, TAMANHO_BLOCO)
+    return [TAMANHO_BLOCO] * inteiros + ([resto] if resto else [])
+
+
+def build_bootstrap(df, n_reamostras=N_REAMOSTRAS, seed=0, processos=1, dimensoes=DIMENSOES, so_grupos=None):
+    """Tabela indexada por (dimensão, grupo, estatística) com estimativa e IC.
+
+    O IC é o intervalo percentil das reamostras (95%). dimensoes/so_grupos
+    restringem o cálculo a uma parte dos grupos (usado pelo build de
+    artefatos para dividir o trabalho); as sementes não mudam, então as
+    partes juntas dão o mesmo resultado do cálculo completo.
+    """
+    grupos, tarefas = [], []
+    for d, dimensao in enumerate(DIMENSOES):
+        if dimensao not in dimensoes:
+            continue
+        for g, (grupo, dados) in enumerate(df.groupby(dimensao, observed=True)[VENDAS]):
+            if so_grupos is not None and grupo not in so_grupos:
+                continue
+            vendas = dados.to_numpy(dtype="float64")
+            grupos.append((dimensao, grupo, vendas))
+            tarefas += [
+                (len(grupos) - 1, vendas, [seed, d, g, b], tamanho)
+                for b, tamanho in enumerate(_blocos(n_reamostras))
+            ]
+
+    if processos > 1:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            blocos = list(pool.map(_bloco, *zip(*(t[1:] for t in tarefas)), chunksize=8))
+    else:
+        blocos = [_bloco(*t[1:]) for t in tarefas]
+
+    reamostras = [[] for _ in grupos]
+    for (i, *_), bloco in zip(tarefas, blocos):
+        reamostras[i].append(bloco)
+
+    alfa = (1 - NIVEL) / 2 * 100
+    linhas = []
+    for (dimensao, grupo, vendas), partes in zip(grupos, reamostras):
+        amostras = np.concatenate(partes)
+        estimativas = estatisticas_de(vendas)
+        # Grupos com um jogo (ou vendas constantes) não têm correlação: IC fica NaN
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            inferior, superior = np.nanpercentile(amostras, [alfa, 100 - alfa], axis=0)
+        for nome, est, inf, sup in zip(ESTATISTICAS, estimativas, inferior, superior):
+            linhas.append((dimensao, grupo, nome, est, inf, sup, len(vendas)))
+
+    tabela = pd.DataFrame(linhas, columns=["Dimensão", "Grupo", "Estatística",
+                                           "Estimativa", "IC Inferior", "IC Superior", "n"])
+    return tabela.set_index(["Dimensão", "Grupo", "Estatística"])
+
+
+def tabela_intervalos(bootstrap, dimensao):
+    """Uma linha por grupo e uma coluna por estatística, no formato "est [inf, sup]"."""
+    tabela = bootstrap.loc[dimensao]
+    texto = tabela.apply(
+        lambda linha: f"{linha['Estimativa']:.2f} [{linha['IC Inferior']:.2f}, {linha['IC Superior']:.2f}]",
+        axis=1
+    )
+    largura = texto.unstack("Estatística")[ESTATISTICAS]
+    largura.insert(0, "Total de Jogos", tabela["n"].groupby(level="Grupo").first())
+    largura.index.name = DIMENSOES[dimensao]
+    return largura.sort_values("Total de Jogos", ascending=False)
+
+
+def main():
+    from analise.artefatos import pasta_artefatos, salvar_artefato
+    from analise.dados import dataset_version
+    from analise.ingestao import dataset_completo, listar_deltas, versao_completa
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--reamostras", type=int, default=N_REAMOSTRAS)
+    args = parser.parse_args()
+
+    versao_base = dataset_version()
+    versao = versao_completa(versao_base, listar_deltas(versao_base))
+    df = dataset_completo()
+    inicio = time.perf_counter()
+    resultado = build_bootstrap(df, args.reamostras, processos=args.processos)
+    print(f"{len(resultado)} intervalos ({args.reamostras} reamostras por grupo) em "
+          f"{time.perf_counter() - inicio:.2f}s com {args.processos} processo(s)")
+    print(tabela_intervalos(resultado, "Genre").to_string())
+    # Só o número padrão de reamostras vira artefato (é o que a página espera)
+    if args.reamostras == N_REAMOSTRAS:
+        salvar_artefato(versao, "bootstrap", resultado)
+        print(f"-> {pasta_artefatos(versao) / 'bootstrap.pkl'}")
+
+
+if __name__ == "__main__":
+    main()
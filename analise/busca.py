@@ -0,0 +1,134 @@
+"""Índice invertido de títulos e publicadoras para a busca de jogos.
+
+Cada palavra normalizada (minúsculas, sem acentos) aponta para as linhas em
+que aparece. O vocabulário fica ordenado e as listas de linhas ficam
+concatenadas na mesma ordem (formato CSR), então todas as palavras que
+começam com um prefixo ocupam um único trecho contíguo do array.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+
+from analise.dados import CACHE_DIR, escrever_atomico
+
+_PALAVRA = re.compile(r"[a-z0-9]+")
+
+
+def normalizar(texto):
+    sem_acentos = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return sem_acentos.lower()
+
+
+def palavras(texto):
+    return _PALAVRA.findall(normalizar(texto))
+
+
+@dataclass
+class IndicePalavras:
+    vocabulario: np.ndarray
+    offsets: np.ndarray
+    linhas: np.ndarray
+
+    @classmethod
+    def construir(cls, textos):
+        termos, linhas = [], []
+        for linha, texto in enumerate(textos):
+            unicas = set(palavras(texto))
+            termos.extend(unicas)
+            linhas.extend([linha] * len(unicas))
+        termos = np.array(termos, dtype=str)
+        linhas = np.array(linhas, dtype=np.int32)
+
+        vocabulario, ids = np.unique(termos, return_inverse=True)
+        ordem = np.lexsort((linhas, ids))
+        offsets = np.searchsorted(ids[ordem], np.arange(len(vocabulario) + 1))
+        return cls(vocabulario=vocabulario, offsets=offsets, linhas=linhas[ordem])
+
+    def com_prefixo(self, prefixo):
+        # Linhas com alguma palavra que começa com o prefixo
+        inicio = np.searchsorted(self.vocabulario, prefixo, side="left")
+        fim = np.searchsorted(self.vocabulario, prefixo + "\uffff", side="left")
+        return np.unique(self.linhas[self.offsets[inicio]:self.offsets[fim]])
+
+
+@dataclass
+class IndiceBusca:
+    nomes: IndicePalavras
+    publishers: IndicePalavras
+    # Primeira palavra de cada título, para priorizar "começa com"
+    primeira_palavra: np.ndarray
+
+    @classmethod
+    def construir(cls, df):
+        nomes = IndicePalavras.construir(df["Name"])
+        primeiras = [(palavras(nome) or [""])[0] for nome in df["Name"]]
+        return cls(
+            nomes=nomes,
+            publishers=IndicePalavras.construir(df["Publisher"].astype(str)),
+            primeira_palavra=np.array(primeiras, dtype=str),
+        )
+
+    def salvar(self, arquivo):
+        np.savez(
+            arquivo,
+            **{f"nomes_{campo}": getattr(self.nomes, campo) for campo in ("vocabulario", "offsets", "linhas")},
+            **{f"publishers_{campo}": getattr(self.publishers, campo) for campo in ("vocabulario", "offsets", "linhas")},
+            primeira_palavra=self.primeira_palavra,
+        )
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as arquivo:
+            def indice(nome):
+                return IndicePalavras(*(arquivo[f"{nome}_{campo}"] for campo in ("vocabulario", "offsets", "linhas")))
+            return cls(
+                nomes=indice("nomes"),
+                publishers=indice("publishers"),
+                primeira_palavra=arquivo["primeira_palavra"],
+            )
+
+    def buscar(self, consulta, vendas_globais, limite=20):
+        """Retorna as linhas que casam com todas as palavras da consulta.
+
+        Cada palavra é tratada como prefixo (a última costuma estar
+        incompleta). Título vale mais que publicadora; empates são
+        desfeitos pelas vendas globais.
+        """
+        termos = palavras(consulta)
+        if not termos:
+            return np.empty(0, dtype=np.int32)
+
+        por_termo = [(self.nomes.com_prefixo(t), self.publishers.com_prefixo(t)) for t in termos]
+        candidatos = None
+        for nome, publisher in por_termo:
+            linhas = np.union1d(nome, publisher)
+            candidatos = linhas if candidatos is None else np.intersect1d(candidatos, linhas, assume_unique=True)
+        if len(candidatos) == 0:
+            return candidatos
+
+        pontos = np.zeros(len(candidatos))
+        for nome, publisher in por_termo:
+            pontos += 2 * np.isin(candidatos, nome, assume_unique=True)
+            pontos += np.isin(candidatos, publisher, assume_unique=True)
+        pontos += np.char.startswith(self.primeira_palavra[candidatos], termos[0])
+
+        ordem = np.lexsort((-np.asarray(vendas_globais)[candidatos], -pontos))
+        return candidatos[ordem[:limite]]
+
+
+def carregar_indice(df, versao):
+    """Lê o índice salvo ao lado do cache do dataset ou o constrói."""
+    caminho = CACHE_DIR / f"vgsales_busca_{versao[:16]}_{versao.partition('+')[2] or 0}.npz"
+    if caminho.exists():
+        return IndiceBusca.carregar(caminho)
+    indice = IndiceBusca.construir(df)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    def escrever(tmp):
+        with open(tmp, "wb") as arquivo:
+            indice.salvar(arquivo)
+
+    escrever_atomico(caminho, escrever)
+    return indice
@@ -0,0 +1,26 @@
+import importlib
+import logging
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Tempo da primeira importação de cada módulo, agrupado por seção:
+# {seção: {módulo: segundos}}
+tempos_importacao = {}
+
+
+def importar_secao(secao, modulos):
+    """Importa os módulos pesados de uma seção e registra quanto custaram.
+
+    Só a primeira importação no processo é medida; depois disso o módulo
+    já está em sys.modules e o custo é desprezível.
+    """
+    for nome in modulos:
+        if nome in sys.modules:
+            continue
+        inicio = time.perf_counter()
+        importlib.import_module(nome)
+        duracao = time.perf_counter() - inicio
+        tempos_importacao.setdefault(secao, {})[nome] = duracao
+        logger.info("Seção %r: import de %s levou %.1f ms", secao, nome, duracao * 1000)
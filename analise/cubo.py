@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Cubo:
+    """Agregados da Seção 2, calculados uma vez por versão do dataset.
+
+    - celulas: uma linha por (Platform, Genre) com contagem, soma e soma dos
+      quadrados de cada região; as visões por plataforma ou gênero saem
+      daqui por soma das células.
+    - resumo: estatísticas de cada região (describe + moda e variância).
+    - correlacao: matriz de correlação entre as regiões.
+    """
+
+    celulas: pd.DataFrame
+    resumo: pd.DataFrame
+    correlacao: pd.DataFrame
+
+
+def build_cubo(backend):
+    # As agregações rodam no backend (pandas, DuckDB ou Polars)
+    return Cubo(
+        celulas=backend.celulas(),
+        resumo=backend.resumo(),
+        correlacao=backend.correlacao(),
+    )
+
+
+def vendas_por(cubo, dimensao, regiao):
+    # Soma e média de uma região agrupadas por "Platform" ou "Genre"
+    agregado = cubo.celulas.groupby(level=dimensao, observed=True)[["count", f"{regiao}_sum"]].sum()
+    resultado = pd.DataFrame({
+        "sum": agregado[f"{regiao}_sum"],
+        "mean": agregado[f"{regiao}_sum"] / agregado["count"],
+    })
+    return resultado.reset_index()
+
+
+def tabela_plataformas(cubo):
+    tabela = vendas_por(cubo, "Platform", "Global_Sales")
+    tabela.columns = ["Plataforma", "Vendas Totais (M)", "Vendas Médias (M)"]
+    tabela = tabela.sort_values("Vendas Totais (M)", ascending=False)
+
+    # Formatando os valores
+    tabela["Vendas Totais (M)"] = tabela["Vendas Totais (M)"].round(2)
+    tabela["Vendas Médias (M)"] = tabela["Vendas Médias (M)"].round(2)
+    return tabela
+
+
+def tabela_generos(cubo, regiao):
+    tabela = vendas_por(cubo, "Genre", regiao)
+    tabela.columns = ["Gênero", "Total de Vendas (M)", "Média de Vendas (M)"]
+
+    # Formatando os valores para 2 casas decimais
+    tabela["Total de Vendas (M)"] = tabela["Total de Vendas (M)"].round(2)
+    tabela["Média de Vendas (M)"] = tabela["Média de Vendas (M)"].round(2)
+    return tabela
+
+
+def contagem_por(cubo, dimensao):
+    contagem = cubo.celulas.groupby(level=dimensao, observed=True)["count"].sum()
+    return contagem.sort_values(ascending=False)
+
+
+def estatisticas(cubo, regiao):
+    # Série com count/mean/std/min/25%/50%/75%/max/mode/var da região
+    return cubo.resumo[regiao]
+
+
+def momentos(vendas):
+    # n, somas e produtos cruzados das regiões: bastam para atualizar médias,
+    # variâncias e correlações somando os momentos das linhas novas
+    valores = vendas.to_numpy(dtype="float64")
+    return {"n": len(valores), "soma": valores.sum(axis=0), "produtos": valores.T @ valores}
+
+
+def somar_momentos(a, b):
+    return {chave: a[chave] + b[chave] for chave in a}
+
+
+def covariancia(m):
+    return (m["produtos"] - np.outer(m["soma"], m["soma"]) / m["n"]) / (m["n"] - 1)
+
+
+def correlacao_de(m, colunas):
+    cov = covariancia(m)
+    desvios = np.sqrt(np.diag(cov))
+    return pd.DataFrame(cov / np.outer(desvios, desvios), index=colunas, columns=colunas)
+
+
+def somar_celulas(celulas, novas):
+    soma = celulas.add(novas, fill_value=0).sort_index()
+    soma["count"] = soma["count"].astype("int64")
+    return soma
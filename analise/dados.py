@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# Caminhos do dataset original e do cache colunar
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSV_PATH = BASE_DIR / "vgsales.csv"
+CACHE_DIR = BASE_DIR / ".cache"
+
+CATEGORICAS = ["Platform", "Genre", "Publisher"]
+VENDAS = ["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales", "Global_Sales"]
+
+# Nomes dos jogos ficam num único buffer Arrow em vez de um objeto str por
+# linha; Publisher (como Platform e Genre) é categórica, ou seja, códigos
+# inteiros apontando para um dicionário de valores únicos
+TEXTO = pd.StringDtype("pyarrow")
+
+# Versão do formato do cache; incrementar quando mudarem os tipos abaixo
+SCHEMA_VERSION = 2
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _caminhos_cache(csv_path):
+    nome = Path(csv_path).stem
+    return CACHE_DIR / f"{nome}.arrow", CACHE_DIR / f"{nome}.meta.json"
+
+
+def _ler_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# umask do processo, lida uma vez na importação (ler exige trocá-la, o que
+# não é seguro com várias threads)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def liberar_leitura(path):
+    # Arquivos do mkstemp nascem com 0600; os do cache ficam como um arquivo
+    # comum, para o servidor web ou outro usuário do deploy lerem
+    os.chmod(path, 0o644 & ~_UMASK)
+
+
+def escrever_atomico(path, escrever):
+    # Escreve em arquivo temporário e troca de uma vez, para que outro
+    # processo nunca leia um cache pela metade; o nome temporário é único
+    # por chamada, então threads do mesmo processo não se atropelam
+    fd, tmp = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp = Path(tmp)
+    try:
+        escrever(tmp)
+        liberar_leitura(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def read_csv_typed(csv_path=CSV_PATH):
+    # O arquivo é UTF-8; o fallback cobre exportações antigas em Latin-1
+    dtypes = {col: "category" for col in CATEGORICAS}
+    dtypes.update({col: "float32" for col in VENDAS})
+    dtypes["Rank"] = "int32"
+    dtypes["Name"] = TEXTO
+    try:
+        df = pd.read_csv(csv_path, encoding="utf-8", dtype=dtypes)
+    except UnicodeDecodeError:
+        df = pd.read_csv(csv_path, encoding="ISO-8859-1", dtype=dtypes)
+    # "N/A" vira <NA> em vez de transformar a coluna inteira em float
+    df["Year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int16")
+    return df
+
+
+def dataset_version(csv_path=CSV_PATH):
+    """Retorna o hash do CSV, recalculando só quando o mtime muda."""
+    _, meta_path = _caminhos_cache(csv_path)
+    mtime_ns = os.stat(csv_path).st_mtime_ns
+    meta = _ler_meta(meta_path)
+    if meta and meta.get("mtime_ns") == mtime_ns:
+        return meta["sha256"]
+    return _sha256(csv_path)
+
+
+def build_cache(csv_path=CSV_PATH, force=False):
+    """Gera o cache Arrow IPC do CSV, se ainda não existir para esta versão."""
+    cache_path, meta_path = _caminhos_cache(csv_path)
+    mtime_ns = os.stat(csv_path).st_mtime_ns
+    meta = _ler_meta(meta_path)
+
+    if not force and meta and cache_path.exists() and meta.get("schema") == SCHEMA_VERSION:
+        if meta.get("mtime_ns") == mtime_ns:
+            return cache_path
+        # mtime mudou (ex.: checkout do git), mas o conteúdo pode ser o mesmo
+        if meta.get("sha256") == _sha256(csv_path):
+            meta["mtime_ns"] = mtime_ns
+            escrever_atomico(meta_path, lambda p: p.write_text(json.dumps(meta), encoding="utf-8"))
+            return cache_path
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    df = read_csv_typed(csv_path)
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    # Sem compressão: é o que permite mapear o arquivo direto na memória
+    escrever_atomico(cache_path, lambda p: feather.write_feather(tabela, p, compression="uncompressed"))
+
+    meta = {"mtime_ns": mtime_ns, "sha256": _sha256(csv_path), "schema": SCHEMA_VERSION}
+    escrever_atomico(meta_path, lambda p: p.write_text(json.dumps(meta), encoding="utf-8"))
+    return cache_path
+
+
+def load_dataset(csv_path=CSV_PATH):
+    """Carrega o dataset a partir do cache mapeado em memória.
+
+    Vários processos do Streamlit abrindo o mesmo arquivo compartilham as
+    mesmas páginas do cache do sistema operacional.
+    """
+    cache_path = build_cache(csv_path)
+    tabela = feather.read_table(cache_path, memory_map=True)
+    return tabela.to_pandas(split_blocks=True, types_mapper={pa.string(): TEXTO}.get)
+
+
+def build_parquet(csv_path=CSV_PATH):
+    """Cópia em Parquet do cache, usada pelos backends DuckDB e Polars."""
+    cache_path = build_cache(csv_path)
+    parquet_path = cache_path.with_suffix(".parquet")
+    if not parquet_path.exists() or parquet_path.stat().st_mtime_ns < cache_path.stat().st_mtime_ns:
+        tabela = feather.read_table(cache_path, memory_map=True)
+        escrever_atomico(parquet_path, lambda p: pq.write_table(tabela, p))
+    return parquet_path
+
+
+def relatorio_memoria(csv_path=CSV_PATH):
+    """Compara memory_usage(deep=True) do CSV com colunas de texto object com o cache tipado."""
+    # No pandas 3 o read_csv já devolve texto em Arrow; a base de comparação
+    # força object (um str Python por linha), o formato antes desta mudança
+    texto = {coluna: object for coluna in ["Name", *CATEGORICAS]}
+    antes = pd.read_csv(csv_path, encoding="utf-8", dtype=texto).memory_usage(deep=True)
+    depois = load_dataset(csv_path).memory_usage(deep=True)
+    relatorio = pd.DataFrame({"antes (bytes)": antes, "depois (bytes)": depois})
+    relatorio["redução"] = relatorio["antes (bytes)"] / relatorio["depois (bytes)"]
+    return relatorio
+
+
+if __name__ == "__main__":
+    relatorio = relatorio_memoria()
+    print(relatorio.to_string(formatters={"redução": "{:.1f}x".format}))
+    total_antes, total_depois = relatorio[["antes (bytes)", "depois (bytes)"]].sum()
+    print(f"\nTotal: {total_antes / 2**20:.2f} MB -> {total_depois / 2**20:.2f} MB "
+          f"({total_antes / total_depois:.1f}x menor)")
@@ -0,0 +1,90 @@
+import gzip
+import io
+import os
+
+from analise.dados import CACHE_DIR, escrever_atomico
+
+# Rota do servidor.py que entrega o arquivo de exportação direto do disco;
+# o servidor define esta variável de ambiente quando a rota existe
+ROTA = "/exportar"
+VARIAVEL_ROTA = "ANALISE_ROTA_EXPORTAR"
+
+# Formato -> (extensão, tipo MIME)
+FORMATOS = {
+    "CSV compactado (.csv.gz)": ("csv.gz", "application/gzip"),
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# Linhas escritas por vez, para nunca montar o CSV inteiro em memória
+CHUNK_ROWS = 50_000
+
+
+def _escrever_csv(df, arquivo):
+    for inicio in range(0, len(df), CHUNK_ROWS):
+        df.iloc[inicio:inicio + CHUNK_ROWS].to_csv(
+            arquivo, header=(inicio == 0), index=False, na_rep="N/A"
+        )
+
+
+def caminho_export(versao, formato):
+    extensao, _ = FORMATOS[formato]
+    # Mesma chave do índice de busca e dos artefatos: hash do CSV + nº de lotes
+    base, _, lotes = versao.partition("+")
+    return CACHE_DIR / f"vgsales_{base[:16]}_{lotes or 0}.{extensao}"
+
+
+def rota_export(formato):
+    """URL do arquivo no servidor.py, ou None rodando com `streamlit run`."""
+    if not os.environ.get(VARIAVEL_ROTA):
+        return None
+    return f"{ROTA}/{FORMATOS[formato][0]}"
+
+
+def build_export(df, versao, formato):
+    """Gera (uma vez por versão do dataset) o arquivo de exportação em disco."""
+    extensao, _ = FORMATOS[formato]
+    destino = caminho_export(versao, formato)
+    if destino.exists():
+        return destino
+
+    def escrever(tmp):
+        if extensao == "parquet":
+            df.to_parquet(tmp, index=False)
+        elif extensao == "csv.gz":
+            with gzip.open(tmp, "wt", encoding="utf-8", newline="") as arquivo:
+                _escrever_csv(df, arquivo)
+        else:
+            with open(tmp, "w", encoding="utf-8", newline="") as arquivo:
+                _escrever_csv(df, arquivo)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    escrever_atomico(destino, escrever)
+    return destino
+
+
+def export_atual(formato):
+    """Arquivo de exportação da versão atual do dataset (com os lotes ingeridos).
+
+    Só carrega o dataset quando o arquivo desta versão ainda não existe.
+    """
+    from analise.dados import dataset_version
+    from analise.ingestao import dataset_completo, listar_deltas, versao_completa
+
+    versao_base = dataset_version()
+    versao = versao_completa(versao_base, listar_deltas(versao_base))
+    destino = caminho_export(versao, formato)
+    if destino.exists():
+        return destino
+    return build_export(dataset_completo(), versao, formato)
+
+
+def exportar_visao(df, formato):
+    # Visões da página são pequenas (agregados), então ficam em memória
+    extensao, _ = FORMATOS[formato]
+    if extensao == "parquet":
+        return df.to_parquet(index=False)
+    buffer = io.StringIO()
+    _escrever_csv(df, buffer)
+    dados = buffer.getvalue().encode("utf-8")
+    return gzip.compress(dados) if extensao == "csv.gz" else dados
@@ -0,0 +1,158 @@
+"""Filtro cruzado Platform x Genre x Publisher x faixa de anos.
+
+Cada valor de cada dimensão tem um bitmap (np.packbits, 1 bit por jogo)
+calculado uma vez por versão do dataset. Um filtro vira OR dos bitmaps dos
+valores escolhidos em cada dimensão e AND entre as dimensões; para os anos
+há bitmaps acumulados ("ano <= a"), então qualquer faixa sai de duas
+operações. As tabelas são agregadas só sobre as linhas da máscara final.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analise.cubo import Cubo
+from analise.dados import VENDAS
+
+DIMENSOES_FILTRO = ["Platform", "Genre", "Publisher"]
+
+
+@dataclass(frozen=True)
+class Filtro:
+    """Valores escolhidos por dimensão; vazio = sem restrição naquela dimensão."""
+
+    plataformas: tuple = ()
+    generos: tuple = ()
+    publishers: tuple = ()
+    anos: tuple = None  # (primeiro, último), inclusive
+    incluir_sem_ano: bool = True  # só vale junto com uma faixa de anos
+
+    def ativo(self):
+        return bool(self.plataformas or self.generos or self.publishers or self.anos)
+
+
+def _empacotar(mascara):
+    return np.packbits(mascara)
+
+
+class IndiceBitmap:
+    """Bitmaps por valor de cada dimensão e por ano, sobre um dataset fixo."""
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.valores, self.bitmaps, self._codigos = {}, {}, {}
+        for dimensao in DIMENSOES_FILTRO:
+            coluna = df[dimensao].astype("category")
+            codigos = coluna.cat.codes.to_numpy().astype(np.intp)
+            self.valores[dimensao] = coluna.cat.categories.astype(str).tolist()
+            self.bitmaps[dimensao] = self._bitmaps_por_codigo(codigos, len(self.valores[dimensao]))
+            self._codigos[dimensao] = codigos
+
+        anos = df["Year"].to_numpy(dtype="float64", na_value=np.nan)
+        sem_ano = np.isnan(anos)
+        self.anos = np.unique(anos[~sem_ano]).astype(int)
+        # acumulados[i]: jogos com ano <= self.anos[i]
+        posicoes = np.searchsorted(self.anos, np.where(sem_ano, np.inf, anos))
+        por_ano = np.zeros((len(self.anos), self.n), dtype=bool)
+        por_ano[posicoes[~sem_ano], np.flatnonzero(~sem_ano)] = True
+        self.acumulados = np.packbits(np.logical_or.accumulate(por_ano, axis=0), axis=1)
+        self.sem_ano = _empacotar(sem_ano)
+
+        self.vendas = df[VENDAS].to_numpy(dtype="float64")
+        self._todas = _empacotar(np.ones(self.n, dtype=bool))
+
+    def _bitmaps_por_codigo(self, codigos, n_valores):
+        # Linhas ordenadas por código: cada valor marca só o seu trecho
+        ordem = np.argsort(codigos, kind="stable")
+        limites = np.searchsorted(codigos[ordem], np.arange(n_valores + 1))
+        bitmaps = np.empty((n_valores, (self.n + 7) // 8), dtype=np.uint8)
+        linha = np.zeros(self.n, dtype=bool)
+        for c in range(n_valores):
+            trecho = ordem[limites[c]:limites[c + 1]]
+            linha[trecho] = True
+            bitmaps[c] = np.packbits(linha)
+            linha[trecho] = False
+        return bitmaps
+
+    def _ate(self, ano):
+        # Bitmap de "ano <= ano" (vazio antes do primeiro ano)
+        i = np.searchsorted(self.anos, ano, side="right") - 1
+        return self.acumulados[i] if i >= 0 else np.zeros_like(self._todas)
+
+    def mascara(self, filtro):
+        """Bitmap empacotado das linhas que passam no filtro."""
+        resultado = self._todas.copy()
+        escolhas = zip(DIMENSOES_FILTRO, [filtro.plataformas, filtro.generos, filtro.publishers])
+        for dimensao, escolhidos in escolhas:
+            if not escolhidos:
+                continue
+            valores = self.valores[dimensao]
+            codigos = [valores.index(v) for v in escolhidos if v in valores]
+            if not codigos:
+                return np.zeros_like(self._todas)
+            resultado &= np.bitwise_or.reduce(self.bitmaps[dimensao][codigos], axis=0)
+        if filtro.anos is not None:
+            primeiro, ultimo = filtro.anos
+            faixa = self._ate(ultimo) & ~self._ate(primeiro - 1)
+            if filtro.incluir_sem_ano:
+                faixa |= self.sem_ano
+            resultado &= faixa
+        return resultado
+
+    def linhas(self, filtro):
+        """Posições das linhas que passam no filtro."""
+        return np.flatnonzero(np.unpackbits(self.mascara(filtro), count=self.n))
+
+    def cubo(self, filtro):
+        """Mesmo Cubo da Seção 2, agregado só sobre as linhas filtradas."""
+        linhas = self.linhas(filtro)
+        vendas = self.vendas[linhas]
+        return Cubo(
+            celulas=self._celulas(linhas, vendas),
+            resumo=_resumo(vendas),
+            correlacao=pd.DataFrame(vendas, columns=VENDAS).corr(),
+        )
+
+    def _celulas(self, linhas, vendas):
+        plataformas = self.valores["Platform"]
+        generos = self.valores["Genre"]
+        celula = self._codigos["Platform"][linhas] * len(generos) + self._codigos["Genre"][linhas]
+        tamanho = len(plataformas) * len(generos)
+        colunas = {"count": np.bincount(celula, minlength=tamanho)}
+        for j, regiao in enumerate(VENDAS):
+            colunas[f"{regiao}_sum"] = np.bincount(celula, vendas[:, j], minlength=tamanho)
+        for j, regiao in enumerate(VENDAS):
+            colunas[f"{regiao}_sumsq"] = np.bincount(celula, vendas[:, j] ** 2, minlength=tamanho)
+        indice = pd.MultiIndex.from_product([plataformas, generos], names=["Platform", "Genre"])
+        celulas = pd.DataFrame(colunas, index=indice)
+        return celulas[celulas["count"] > 0]
+
+    def contar_sucessos(self, filtro, limiar):
+        # Mesmo formato de backend.contar_sucessos: (gêneros, n, k) dos gêneros presentes
+        linhas = self.linhas(filtro)
+        generos = self._codigos["Genre"][linhas]
+        n_generos = len(self.valores["Genre"])
+        sucesso = self.vendas[linhas, VENDAS.index("Global_Sales")].astype("float32") >= np.float32(limiar)
+        n = np.bincount(generos, minlength=n_generos)
+        k = np.bincount(generos, sucesso, minlength=n_generos).astype("int64")
+        presentes = n > 0
+        return np.array(self.valores["Genre"], dtype=object)[presentes], n[presentes], k[presentes]
+
+    def valores_de(self, filtro, coluna, abaixo_de=None):
+        valores = self.vendas[self.linhas(filtro), VENDAS.index(coluna)]
+        if abaixo_de is not None:
+            valores = valores[valores < abaixo_de]
+        return pd.Series(valores, name=coluna)
+
+
+def _resumo(vendas):
+    # Mesmo formato do PandasBackend.resumo (describe + moda e variância)
+    vendas = pd.DataFrame(vendas, columns=VENDAS)
+    resumo = vendas.describe()
+    if len(vendas):
+        resumo.loc["mode"] = vendas.mode().iloc[0]
+    else:
+        resumo.loc["mode"] = np.nan
+    resumo.loc["var"] = vendas.var()
+    return resumo
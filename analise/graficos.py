@@ -0,0 +1,94 @@
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from matplotlib.ticker import FuncFormatter
+from scipy.stats import norm
+
+from analise.artefatos import ler_figura
+from analise.memoria import CacheLimitado
+
+
+class CacheDeFiguras(CacheLimitado):
+    """Cache LRU dos PNGs já renderizados, limitado por total de bytes.
+
+    As chaves são tuplas (tipo do gráfico, região/gênero, versão do dataset),
+    então rever o mesmo gráfico não refaz KDE nem rasterização.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        super().__init__("figuras", max_bytes, tamanho=len)
+
+    def renderizar(self, chave, desenhar):
+        png = self.get(chave)
+        if png is None:
+            # Primeiro o PNG pré-renderizado pelo build (python -m analise.artefatos)
+            png = ler_figura(chave)
+            if png is None:
+                png = figura_para_png(desenhar())
+            self.put(chave, png)
+        return png
+
+
+# Um cache por processo, compartilhado entre as sessões
+cache_figuras = CacheDeFiguras()
+
+
+def figura_para_png(fig, dpi=150):
+    # Sempre fecha a figura, para não acumular estado global no pyplot
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def grafico_top_plataformas(top10_plataformas):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.barplot(
+        data=top10_plataformas,
+        x="Vendas Totais (M)",
+        y="Plataforma",
+        palette="viridis",
+        ax=ax
+    )
+    ax.set_xlabel("Vendas Totais (Milhões de Cópias)")
+    ax.set_ylabel("")
+    return fig
+
+
+def grafico_distribuicao_regiao(vendas_filtradas):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.histplot(vendas_filtradas, bins=30, kde=True, ax=ax)
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{x:,.0f}".replace(",", ".")))
+    ax.set_xlabel("Quantidade de Vendas (unidades)")
+    ax.set_ylabel("Frequência de Jogos")
+    return fig
+
+
+def grafico_normal_genero(sales_filtered, genero):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.histplot(sales_filtered, kde=True, stat='density', ax=ax)
+    xmin, xmax = ax.get_xlim()
+    x = np.linspace(xmin, xmax, 100)
+    ax.plot(x, norm.pdf(x, sales_filtered.mean(), sales_filtered.std()), 'r--', label='Normal Teórica')
+    ax.set_title(f"Distribuição de Vendas - {genero} (Filtrado < 5M)")
+    ax.set_xlabel("Vendas Globais (Milhões)")
+    return fig
+
+
+def grafico_qq(pontos, genero):
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.scatter(pontos["teoricos"], pontos["observados"], s=10)
+    reta = pontos["inclinacao"] * pontos["teoricos"] + pontos["intercepto"]
+    ax.plot(pontos["teoricos"], reta, 'r--', label='Normal Teórica')
+    ax.set_title(f"Gráfico Q-Q - {genero}")
+    ax.set_xlabel("Quantis Teóricos")
+    ax.set_ylabel("Vendas Globais (Milhões)")
+    return fig
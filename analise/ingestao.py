@@ -0,0 +1,282 @@
+"""Ingestão incremental de novas linhas de vendas.
+
+Arquivos CSV com o mesmo cabeçalho de vgsales.csv colocados em ingestao/
+são validados e gravados como Parquet em .cache/deltas/<versão do CSV>/.
+Cada arquivo é primeiro reservado com um rename atômico para
+ingestao/processando/, então reruns e processos simultâneos nunca ingerem
+o mesmo lote duas vezes. Depois o CSV vai para ingestao/processados/ (ou
+ingestao/rejeitados/, junto com o motivo); se o processo cair no meio, o
+arquivo volta de processando/ para a fila na sincronização seguinte. A
+versão do dataset passa a ser "<hash do CSV>+<n>", onde n é o número de
+lotes ingeridos.
+
+DatasetIncremental mantém o DataFrame, o cubo, os momentos da correlação
+e as vendas ordenadas por gênero, aplicando só os lotes novos. Trocar o
+vgsales.csv muda o hash e recomeça tudo do zero.
+
+    python -m analise.ingestao novas_vendas.csv
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analise.backends import PandasBackend, celulas_de
+from analise.binomial import mesclar_vendas, ordenar_por_grupo
+from analise.cubo import (
+    Cubo,
+    build_cubo,
+    correlacao_de,
+    covariancia,
+    momentos,
+    somar_celulas,
+    somar_momentos,
+)
+from analise.dados import (
+    BASE_DIR,
+    CACHE_DIR,
+    CATEGORICAS,
+    CSV_PATH,
+    VENDAS,
+    dataset_version,
+    liberar_leitura,
+    load_dataset,
+    read_csv_typed,
+)
+
+logger = logging.getLogger(__name__)
+
+INGESTAO_DIR = BASE_DIR / "ingestao"
+DELTAS_DIR = CACHE_DIR / "deltas"
+# Arquivo parado em processando/ há mais tempo que isso (s) é de uma
+# ingestão interrompida (o processo caiu no meio) e volta para a fila
+PENDENTE_EXPIRA = 600
+COLUNAS = ["Rank", "Name", "Platform", "Year", "Genre", "Publisher", *VENDAS]
+
+
+class ErroDeValidacao(ValueError):
+    pass
+
+
+def validar_colunas(colunas):
+    if list(colunas) != COLUNAS:
+        raise ErroDeValidacao(
+            f"Colunas diferentes do dataset (mudança de esquema exige reconstruir o "
+            f"vgsales.csv): esperado {COLUNAS}, recebido {list(colunas)}"
+        )
+
+
+def validar(df):
+    validar_colunas(df.columns)
+    problemas = []
+    for coluna in ["Name", "Platform", "Genre"]:
+        if df[coluna].isna().any():
+            problemas.append(f"{coluna} vazio em {int(df[coluna].isna().sum())} linha(s)")
+    negativas = (df[VENDAS] < 0).any(axis=1)
+    if negativas.any():
+        problemas.append(f"vendas negativas em {int(negativas.sum())} linha(s)")
+    if df[VENDAS].isna().any(axis=1).any():
+        problemas.append("vendas vazias")
+    if problemas:
+        raise ErroDeValidacao("; ".join(problemas))
+
+
+def _pasta_deltas(versao_base):
+    return DELTAS_DIR / versao_base[:16]
+
+
+def listar_deltas(versao_base):
+    pasta = _pasta_deltas(versao_base)
+    return sorted(pasta.glob("*.parquet")) if pasta.exists() else []
+
+
+def versao_completa(versao_base, deltas):
+    return f"{versao_base}+{len(deltas)}" if deltas else versao_base
+
+
+def _cabecalho(arquivo):
+    try:
+        return list(pd.read_csv(arquivo, encoding="utf-8", nrows=0).columns)
+    except UnicodeDecodeError:
+        return list(pd.read_csv(arquivo, encoding="ISO-8859-1", nrows=0).columns)
+
+
+def ingerir(arquivo, csv_path=CSV_PATH):
+    """Valida um CSV de novas vendas e grava o lote em .cache/deltas/."""
+    arquivo = Path(arquivo)
+    try:
+        # Cabeçalho antes da leitura tipada, que falharia com KeyError sem Year
+        validar_colunas(_cabecalho(arquivo))
+        novo = read_csv_typed(arquivo)
+    except ErroDeValidacao:
+        raise
+    except ValueError as erro:
+        # Tipos que não convertem (ex.: texto em coluna de vendas) ou arquivo vazio
+        raise ErroDeValidacao(str(erro)) from erro
+    validar(novo)
+
+    versao_base = dataset_version(csv_path)
+    pasta = _pasta_deltas(versao_base)
+    pasta.mkdir(parents=True, exist_ok=True)
+    return _gravar_lote(pasta, len(listar_deltas(versao_base)), novo)
+
+
+def _gravar_lote(pasta, indice, novo):
+    # O número do lote é reservado com os.link, que falha se o nome já existe:
+    # dois processos ingerindo ao mesmo tempo ficam com números diferentes
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=pasta)
+    os.close(fd)
+    tmp = Path(tmp)
+    try:
+        novo.to_parquet(tmp, index=False)
+        liberar_leitura(tmp)
+        while True:
+            destino = pasta / f"{indice:06d}.parquet"
+            try:
+                os.link(tmp, destino)
+                return destino
+            except FileExistsError:
+                indice += 1
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _mover(arquivo, subpasta):
+    pasta = INGESTAO_DIR / subpasta
+    pasta.mkdir(parents=True, exist_ok=True)
+    return Path(shutil.move(str(arquivo), pasta / arquivo.name))
+
+
+def _reservar(arquivo):
+    """Move o CSV para processando/; None se outro rerun já o pegou."""
+    pasta = INGESTAO_DIR / "processando"
+    pasta.mkdir(parents=True, exist_ok=True)
+    destino = pasta / arquivo.name
+    try:
+        os.replace(arquivo, destino)
+    except FileNotFoundError:
+        return None
+    # O rename mantém o mtime original; a hora da reserva marca a idade
+    os.utime(destino)
+    return destino
+
+
+def recuperar_pendentes(expira=PENDENTE_EXPIRA):
+    """Devolve para ingestao/ os CSVs de ingestões interrompidas."""
+    agora = time.time()
+    recuperados = []
+    for arquivo in sorted((INGESTAO_DIR / "processando").glob("*.csv")):
+        try:
+            if agora - arquivo.stat().st_mtime < expira:
+                continue  # ainda pode estar sendo ingerido por outro processo
+            os.replace(arquivo, INGESTAO_DIR / arquivo.name)
+        except FileNotFoundError:
+            continue
+        logger.warning("Lote %s ficou em processando/; voltou para a fila", arquivo.name)
+        recuperados.append(arquivo.name)
+    return recuperados
+
+
+def sincronizar(csv_path=CSV_PATH):
+    """Ingere os CSVs deixados em ingestao/; retorna os lotes novos."""
+    if not INGESTAO_DIR.exists():
+        return []
+    # Na primeira chamada do processo (e depois, a cada sincronização)
+    recuperar_pendentes()
+    novos = []
+    for arquivo in sorted(INGESTAO_DIR.glob("*.csv")):
+        reservado = _reservar(arquivo)
+        if reservado is None:
+            continue
+        try:
+            novos.append(ingerir(reservado, csv_path))
+        except ErroDeValidacao as erro:
+            logger.warning("Lote %s rejeitado: %s", arquivo.name, erro)
+            rejeitado = _mover(reservado, "rejeitados")
+            rejeitado.with_name(rejeitado.name + ".erro.txt").write_text(str(erro), encoding="utf-8")
+        else:
+            _mover(reservado, "processados")
+    return novos
+
+
+def concatenar(df, novo):
+    # Une as categorias antes do concat para não cair para dtype object
+    tipos = {
+        coluna: pd.CategoricalDtype(df[coluna].cat.categories.union(novo[coluna].cat.categories))
+        for coluna in CATEGORICAS
+    }
+    return pd.concat([df.astype(tipos), novo.astype(tipos)], ignore_index=True)
+
+
+def dataset_completo(csv_path=CSV_PATH):
+    """Dataset base com todos os lotes ingeridos, sem os agregados."""
+    df = load_dataset(csv_path)
+    for caminho in listar_deltas(dataset_version(csv_path)):
+        df = concatenar(df, pd.read_parquet(caminho))
+    return df
+
+
+class DatasetIncremental:
+    """Dataset em memória com agregados atualizados a cada lote ingerido."""
+
+    def __init__(self, df):
+        self.df = df
+        self.ordenadas = ordenar_por_grupo(df, "Genre", "Global_Sales")
+        self.cubo = build_cubo(PandasBackend(df, self.ordenadas))
+        self.momentos = momentos(df[VENDAS])
+        self.aplicados = []
+        self._lock = threading.Lock()
+
+    def atualizar(self, deltas):
+        # Os lotes só são acrescentados, então basta aplicar os que faltam
+        with self._lock:
+            for caminho in deltas[len(self.aplicados):]:
+                self.aplicar(pd.read_parquet(caminho))
+                self.aplicados.append(caminho)
+        return self
+
+    def aplicar(self, novo):
+        self.df = concatenar(self.df, novo)
+        self.ordenadas = mesclar_vendas(self.ordenadas, novo["Genre"].astype(str), novo["Global_Sales"])
+        self.momentos = somar_momentos(self.momentos, momentos(novo[VENDAS]))
+
+        self.cubo = Cubo(
+            celulas=somar_celulas(self.cubo.celulas, celulas_de(novo)),
+            resumo=self._resumo(novo),
+            correlacao=correlacao_de(self.momentos, VENDAS),
+        )
+
+    def _resumo(self, novo):
+        resumo = self.cubo.resumo.copy()
+        m = self.momentos
+        variancias = np.diag(covariancia(m))
+        resumo.loc["count"] = m["n"]
+        resumo.loc["mean"] = m["soma"] / m["n"]
+        resumo.loc["var"] = variancias
+        resumo.loc["std"] = np.sqrt(variancias)
+        vendas_novas = novo[VENDAS].astype("float64")
+        resumo.loc["min"] = np.minimum(resumo.loc["min"], vendas_novas.min())
+        resumo.loc["max"] = np.maximum(resumo.loc["max"], vendas_novas.max())
+        # Quartis e moda não são somáveis; saem das colunas já concatenadas
+        vendas = self.df[VENDAS].astype("float64")
+        quartis = vendas.quantile([0.25, 0.5, 0.75])
+        resumo.loc[["25%", "50%", "75%"]] = quartis.to_numpy()
+        resumo.loc["mode"] = vendas.mode().iloc[0]
+        return resumo
+
+    def backend(self):
+        return PandasBackend(self.df, self.ordenadas)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for caminho in sys.argv[1:]:
+        print(f"{caminho} -> {ingerir(caminho)}")
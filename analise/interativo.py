@@ -0,0 +1,146 @@
+"""Gráficos renderizados no navegador a partir de arrays pequenos.
+
+Em vez de mandar milhares de valores (ou um PNG por interação), o servidor
+envia contagens já agrupadas em bins e curvas KDE reduzidas com LTTB; a
+troca de região/gênero/limiar acontece no próprio plotly, sem rerun.
+O tamanho do payload depende só do número de bins e pontos, não do
+tamanho do dataset.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+BINS = 30
+# Resolução da grade do KDE e pontos enviados depois do LTTB
+BINS_KDE = 512
+PONTOS_KDE = 120
+
+
+def lttb(x, y, n_saida):
+    """Largest-Triangle-Three-Buckets: reduz a curva preservando a forma."""
+    n = len(x)
+    if n_saida >= n or n_saida < 3:
+        return x, y
+    indices = [0]
+    limites = np.linspace(1, n - 1, n_saida - 1).astype(int)
+    anterior = 0
+    for i in range(n_saida - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        # Média do próximo bucket (ou o último ponto)
+        prox_inicio, prox_fim = fim, limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[prox_inicio:prox_fim].mean()
+        media_y = y[prox_inicio:prox_fim].mean()
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        indices.append(anterior)
+    indices.append(n - 1)
+    return x[indices], y[indices]
+
+
+def distribuicao(valores, bins=BINS):
+    """Histograma e curva KDE (em unidades de contagem) de uma série.
+
+    O KDE é calculado sobre um histograma fino suavizado por um kernel
+    gaussiano com a largura de Scott, então o custo depois do histograma
+    não depende do número de linhas.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    contagens, bordas = np.histogram(valores, bins=bins)
+    resultado = {"bordas": bordas, "contagens": contagens, "x": np.empty(0), "kde": np.empty(0)}
+    if len(valores) < 2 or valores.std() == 0:
+        return resultado
+
+    finas, bordas_finas = np.histogram(valores, bins=BINS_KDE, range=(bordas[0], bordas[-1]))
+    passo = bordas_finas[1] - bordas_finas[0]
+    sigma = valores.std(ddof=1) * len(valores) ** (-1 / 5) / passo
+    raio = max(1, int(np.ceil(4 * sigma)))
+    kernel = np.exp(-0.5 * (np.arange(-raio, raio + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+    # "full" + recorte centrado: com poucos valores o kernel fica maior que a
+    # grade, e o modo "same" devolveria um array do tamanho do kernel
+    suavizado = np.convolve(finas, kernel, mode="full")[raio:raio + BINS_KDE]
+
+    # Reescala para a altura das barras (contagem por bin largo)
+    x = (bordas_finas[:-1] + bordas_finas[1:]) / 2
+    kde = suavizado * (BINS_KDE / bins)
+    resultado["x"], resultado["kde"] = lttb(x, kde, PONTOS_KDE)
+    return resultado
+
+
+def figura_distribuicoes(distribuicoes, titulo, eixo_x, rotulo=str):
+    """Uma figura com todas as séries e um menu para alternar entre elas."""
+    fig = go.Figure()
+    nomes = list(distribuicoes)
+    for i, nome in enumerate(nomes):
+        dados = distribuicoes[nome]
+        centros = (dados["bordas"][:-1] + dados["bordas"][1:]) / 2
+        fig.add_bar(x=centros, y=dados["contagens"], width=np.diff(dados["bordas"]),
+                    name=rotulo(nome), visible=(i == 0), marker_color="#4c72b0")
+        fig.add_scatter(x=dados["x"], y=dados["kde"], mode="lines", name="KDE",
+                        visible=(i == 0), line_color="#dd8452")
+
+    botoes = []
+    for i, nome in enumerate(nomes):
+        visiveis = [False] * (2 * len(nomes))
+        visiveis[2 * i] = visiveis[2 * i + 1] = True
+        botoes.append({"label": rotulo(nome), "method": "update", "args": [{"visible": visiveis}]})
+    fig.update_layout(
+        title=titulo,
+        xaxis_title=eixo_x,
+        yaxis_title="Frequência de Jogos",
+        showlegend=False,
+        bargap=0,
+        updatemenus=[{"buttons": botoes, "direction": "down", "x": 1, "xanchor": "right", "y": 1.15}],
+    )
+    return fig
+
+
+def figura_binomial(grade):
+    """Probabilidade de sucesso por gênero com um slider de limiar no navegador.
+
+    grade: tabela com uma linha por (limiar, gênero), como a do build de
+    artefatos.
+    """
+    limiares = sorted(grade["Limiar"].unique())
+    generos = sorted(grade["Gênero"].unique())
+    por_limiar = {
+        limiar: tabela.set_index("Gênero").loc[generos]
+        for limiar, tabela in grade.groupby("Limiar")
+    }
+
+    def dados(limiar):
+        tabela = por_limiar[limiar]
+        p = tabela["Probabilidade (%)"].to_numpy()
+        mais = tabela["IC Superior (%)"].to_numpy() - p
+        menos = p - tabela["IC Inferior (%)"].to_numpy()
+        # Duas casas bastam na tela e reduzem o JSON de todos os passos
+        return p.round(2), mais.round(2), menos.round(2)
+
+    inicial = min(limiares, key=lambda l: abs(l - 0.5))
+    p, mais, menos = dados(inicial)
+    fig = go.Figure(go.Bar(
+        x=generos, y=p,
+        error_y={"type": "data", "array": mais, "arrayminus": menos},
+        marker_color="#636efa",
+    ))
+    passos = []
+    for limiar in limiares:
+        p, mais, menos = dados(limiar)
+        passos.append({
+            "label": f"{limiar:.2f}",
+            "method": "restyle",
+            "args": [{"y": [p], "error_y.array": [mais], "error_y.arrayminus": [menos]}],
+        })
+    fig.update_layout(
+        title="Probabilidade de Vendas ≥ limiar por Gênero (IC de Wald 95%)",
+        yaxis_title="Probabilidade (%)",
+        sliders=[{
+            "active": limiares.index(inicial),
+            "currentvalue": {"prefix": "Limiar (milhões): "},
+            "steps": passos,
+        }],
+    )
+    return fig
@@ -0,0 +1,225 @@
+"""Caches limitados por bytes e medição de memória do processo.
+
+Os objetos grandes de cada versão do dataset (cubo, testes, bootstrap,
+rollup...) ficam num cache LRU com orçamento de bytes, compartilhado entre
+as sessões e sem cópia por chamada, ao contrário do st.cache_data, que
+desserializa uma cópia nova a cada leitura. Os arrays guardados são
+congelados (somente leitura) e os DataFrames contam com o copy-on-write
+do pandas 3, então nenhuma sessão altera o objeto das outras.
+
+As estatísticas (hits, bytes, RSS, memória por sessão) aparecem no painel
+de métricas da página de Análise (?admin=<ANALISE_ADMIN_TOKEN>).
+"""
+
+import dataclasses
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+MB = 1024 * 1024
+ORCAMENTO_DADOS = int(os.environ.get("ANALISE_CACHE_MB", 256)) * MB
+# Sessões sem rerun há mais tempo que isso saem do registro
+SESSAO_EXPIRA = 3600
+
+# Todos os caches limitados do processo, por nome, para o painel de métricas
+caches = {}
+
+
+def tamanho_em_bytes(objeto):
+    """Estimativa do tamanho de um objeto em memória, incluindo o conteúdo."""
+    if isinstance(objeto, (pd.DataFrame, pd.Series, pd.Index)):
+        uso = objeto.memory_usage(deep=True)
+        return int(uso.sum()) if hasattr(uso, "sum") else int(uso)
+    if isinstance(objeto, np.ndarray):
+        return objeto.nbytes
+    if isinstance(objeto, (bytes, bytearray, str)):
+        return sys.getsizeof(objeto)
+    if dataclasses.is_dataclass(objeto) and not isinstance(objeto, type):
+        return sum(tamanho_em_bytes(getattr(objeto, c.name)) for c in dataclasses.fields(objeto))
+    if isinstance(objeto, dict):
+        return sum(tamanho_em_bytes(k) + tamanho_em_bytes(v) for k, v in objeto.items())
+    if isinstance(objeto, (list, tuple, set, frozenset)):
+        return sys.getsizeof(objeto) + sum(tamanho_em_bytes(item) for item in objeto)
+    return sys.getsizeof(objeto)
+
+
+def congelar(objeto):
+    """Marca como somente leitura os arrays NumPy do objeto (recursivo)."""
+    if isinstance(objeto, np.ndarray):
+        objeto.flags.writeable = False
+    elif dataclasses.is_dataclass(objeto) and not isinstance(objeto, type):
+        for campo in dataclasses.fields(objeto):
+            congelar(getattr(objeto, campo.name))
+    elif isinstance(objeto, dict):
+        for valor in objeto.values():
+            congelar(valor)
+    elif isinstance(objeto, (list, tuple)):
+        for item in objeto:
+            congelar(item)
+    return objeto
+
+
+class CacheLimitado:
+    """Cache LRU limitado pelo total de bytes, com contagem de hits e misses."""
+
+    def __init__(self, nome, max_bytes, tamanho=tamanho_em_bytes):
+        self.nome = nome
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._tamanho = tamanho
+        self._itens = OrderedDict()
+        # Chave -> Future dos valores sendo calculados agora (ver memorizar)
+        self._calculando = {}
+        self._lock = threading.Lock()
+        caches[nome] = self
+
+    def __len__(self):
+        return len(self._itens)
+
+    def get(self, chave, padrao=None):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.misses += 1
+                return padrao
+            self.hits += 1
+            self._itens.move_to_end(chave)
+            return item[0]
+
+    def put(self, chave, valor):
+        tamanho = self._tamanho(valor)
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self.total_bytes -= antigo[1]
+            self._itens[chave] = (valor, tamanho)
+            self.total_bytes += tamanho
+            while self.total_bytes > self.max_bytes:
+                _, (_, removido) = self._itens.popitem(last=False)
+                self.total_bytes -= removido
+
+    def memorizar(self, funcao):
+        """Decorador: guarda o resultado por (função, argumentos), congelado.
+
+        Só uma chamada calcula cada chave; as que chegam enquanto isso
+        esperam pelo mesmo resultado, como no st.cache_data.
+        """
+        @wraps(funcao)
+        def envolvida(*args):
+            chave = (funcao.__qualname__, *args)
+            with self._lock:
+                item = self._itens.get(chave)
+                if item is not None:
+                    self.hits += 1
+                    self._itens.move_to_end(chave)
+                    return item[0]
+                futuro = self._calculando.get(chave)
+                calcular = futuro is None
+                if calcular:
+                    self.misses += 1
+                    futuro = self._calculando[chave] = Future()
+                else:
+                    self.hits += 1
+            if not calcular:
+                return futuro.result()
+
+            # Calcula fora do lock: a função pode consultar este mesmo cache.
+            # None também é guardado (ex.: artefato que não existe)
+            try:
+                valor = congelar(funcao(*args))
+                self.put(chave, valor)
+                futuro.set_result(valor)
+                return valor
+            except BaseException as erro:
+                futuro.set_exception(erro)
+                raise
+            finally:
+                with self._lock:
+                    del self._calculando[chave]
+
+        envolvida.cache = self
+        return envolvida
+
+    def estatisticas(self):
+        consultas = self.hits + self.misses
+        return {
+            "itens": len(self),
+            "MB": round(self.total_bytes / MB, 2),
+            "limite (MB)": round(self.max_bytes / MB, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa de acerto (%)": round(100 * self.hits / consultas, 1) if consultas else None,
+        }
+
+
+# Objetos grandes por versão do dataset, compartilhados entre as sessões
+cache_dados = CacheLimitado("dados", ORCAMENTO_DADOS)
+
+
+def rss_bytes():
+    """Memória residente atual do processo (Linux); pico do processo nos demais."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico if sys.platform == "darwin" else pico * 1024
+
+
+# Memória por sessão: atualizado a cada rerun completo pela página
+_sessoes = {}
+_sessoes_lock = threading.Lock()
+
+
+def registrar_sessao(sessao, estado, rss_antes, rss_depois):
+    """Guarda o tamanho do session_state e o crescimento de RSS de um rerun."""
+    agora = time.time()
+    with _sessoes_lock:
+        atual = _sessoes.setdefault(sessao, {"reruns": 0, "RSS alocado (MB)": 0.0})
+        atual["reruns"] += 1
+        atual["session_state (MB)"] = round(tamanho_em_bytes(dict(estado)) / MB, 3)
+        atual["RSS alocado (MB)"] = round(atual["RSS alocado (MB)"] + max(rss_depois - rss_antes, 0) / MB, 2)
+        atual["último rerun"] = agora
+        for antiga in [s for s, d in _sessoes.items() if agora - d["último rerun"] > SESSAO_EXPIRA]:
+            del _sessoes[antiga]
+
+
+def sessoes():
+    # IDs de sessão não aparecem no painel, só um resumo do hash
+    with _sessoes_lock:
+        tabela = pd.DataFrame.from_dict(
+            {hashlib.sha256(s.encode()).hexdigest()[:12]: d for s, d in _sessoes.items()}, orient="index"
+        )
+    if len(tabela):
+        tabela["último rerun"] = pd.to_datetime(tabela["último rerun"], unit="s")
+    return tabela
+
+
+def caches_streamlit():
+    """Bytes em cada st.cache_data/st.cache_resource, pelas estatísticas do próprio Streamlit."""
+    from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
+
+    linhas = []
+    for provedor in (get_data_cache_stats_provider(), get_resource_cache_stats_provider()):
+        estatisticas = provedor.get_stats()
+        if isinstance(estatisticas, dict):
+            estatisticas = [e for lista in estatisticas.values() for e in lista]
+        linhas += [(e.category_name, e.cache_name, e.byte_length) for e in estatisticas]
+    tabela = pd.DataFrame(linhas, columns=["tipo", "função", "bytes"])
+    return tabela.groupby(["tipo", "função"], as_index=False).agg(
+        entradas=("bytes", "size"), MB=("bytes", lambda b: round(b.sum() / MB, 3))
+    )
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import anderson, kurtosis, normaltest, probplot, shapiro, skew
+
+from analise.dados import VENDAS
+
+# Acima de 5000 valores o Shapiro-Wilk do scipy perde precisão, então
+# grupos maiores são testados em subamostras
+AMOSTRA_MAX = 5000
+N_BOOTSTRAP = 50
+# Pontos guardados para o gráfico Q-Q
+QQ_PONTOS = 200
+
+DIMENSOES = ["Genre", "Platform"]
+TODOS = "Todos"
+
+
+def _shapiro(valores, rng):
+    if len(valores) <= AMOSTRA_MAX:
+        stat, p_value = shapiro(valores)
+        return stat, p_value, "exato"
+    resultados = np.array([
+        shapiro(rng.choice(valores, AMOSTRA_MAX, replace=False))
+        for _ in range(N_BOOTSTRAP)
+    ])
+    stat, p_value = np.median(resultados, axis=0)
+    return stat, p_value, f"mediana de {N_BOOTSTRAP} subamostras de {AMOSTRA_MAX}"
+
+
+def _anderson(valores):
+    # A partir do SciPy 1.17 é preciso escolher o método do p-value, e os
+    # valores críticos deixam de ser retornados; a estatística é a mesma
+    try:
+        return anderson(valores, dist="norm", method="interpolate").statistic
+    except TypeError:
+        return anderson(valores, dist="norm").statistic
+
+
+def _qq(valores):
+    (teoricos, observados), (inclinacao, intercepto, r) = probplot(valores)
+    indices = np.unique(np.linspace(0, len(valores) - 1, QQ_PONTOS).astype(int))
+    return {
+        "teoricos": teoricos[indices],
+        "observados": observados[indices],
+        "inclinacao": inclinacao,
+        "intercepto": intercepto,
+        "r": r,
+    }
+
+
+def testar_normalidade(valores, rng):
+    valores = np.asarray(valores, dtype="float64")
+    # normaltest exige pelo menos 8 observações, e nenhum teste faz sentido
+    # com valores constantes (ex.: plataforma sem vendas no Japão)
+    if len(valores) < 8 or np.ptp(valores) == 0:
+        return None, None
+    shapiro_stat, shapiro_p, metodo = _shapiro(valores, rng)
+    k2_stat, k2_p = normaltest(valores)
+    ad_stat = _anderson(valores)
+    # Valor crítico a 5% para a normal com média/desvio estimados (Stephens,
+    # a mesma tabela que o scipy usa)
+    n = len(valores)
+    ad_critico = 0.787 / (1 + 4 / n - 25 / n ** 2)
+    resultado = {
+        "n": len(valores),
+        "shapiro_stat": shapiro_stat,
+        "shapiro_p": shapiro_p,
+        "shapiro_metodo": metodo,
+        "k2_stat": k2_stat,
+        "k2_p": k2_p,
+        "anderson_stat": ad_stat,
+        "anderson_critico_5": ad_critico,
+        "assimetria": skew(valores),
+        "curtose": kurtosis(valores),
+    }
+    return resultado, _qq(valores)
+
+
+def build_normalidade(df, seed=0, regioes=VENDAS):
+    """Testes de normalidade para todos os gêneros, plataformas e regiões.
+
+    Retorna (tabela, qq): a tabela é indexada por (dimensão, grupo, região)
+    e qq é um dicionário com os pontos do gráfico Q-Q para as mesmas chaves.
+    Cada região tem sua própria semente, então calcular as regiões em
+    processos separados dá o mesmo resultado.
+    """
+    linhas, qq = {}, {}
+    for regiao in regioes:
+        rng = np.random.default_rng([seed, VENDAS.index(regiao)])
+        grupos = [(TODOS, TODOS, df[regiao])]
+        for dimensao in DIMENSOES:
+            grupos += [
+                (dimensao, grupo, valores)
+                for grupo, valores in df.groupby(dimensao, observed=True)[regiao]
+            ]
+        for dimensao, grupo, valores in grupos:
+            resultado, pontos = testar_normalidade(valores.to_numpy(), rng)
+            if resultado is None:
+                continue
+            linhas[(dimensao, grupo, regiao)] = resultado
+            qq[(dimensao, grupo, regiao)] = pontos
+
+    tabela = pd.DataFrame.from_dict(linhas, orient="index")
+    tabela.index.names = ["dimensao", "grupo", "regiao"]
+    return tabela, qq
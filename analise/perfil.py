@@ -0,0 +1,90 @@
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from analise import memoria
+
+# Tempos de cada bloco na última execução, lidos pelo benchmark de reruns
+CHAVE_TEMPOS = "_tempos_blocos"
+# Quantas vezes o script inteiro e cada fragmento rodaram nesta sessão
+CHAVE_EXECUCOES = "_execucoes"
+CHAVE_INICIO = "_inicio_rerun"
+CHAVE_RSS = "_rss_rerun"
+
+
+def _registrar_execucao(nome, duracao):
+    execucoes = st.session_state.setdefault(CHAVE_EXECUCOES, {})
+    atual = execucoes.setdefault(nome, {"execuções": 0, "último (ms)": 0.0})
+    atual["execuções"] += 1
+    atual["último (ms)"] = round(duracao * 1000, 1)
+
+
+def iniciar_rerun():
+    st.session_state[CHAVE_TEMPOS] = {}
+    st.session_state[CHAVE_INICIO] = time.perf_counter()
+    st.session_state[CHAVE_RSS] = memoria.rss_bytes()
+
+
+def finalizar_rerun():
+    _registrar_execucao("script completo", time.perf_counter() - st.session_state[CHAVE_INICIO])
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        memoria.registrar_sessao(ctx.session_id, st.session_state, st.session_state[CHAVE_RSS], memoria.rss_bytes())
+
+
+@contextmanager
+def medir(bloco):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Sobrescreve: num rerun de fragmento só os blocos dele são medidos
+        st.session_state.setdefault(CHAVE_TEMPOS, {})[bloco] = time.perf_counter() - inicio
+
+
+@contextmanager
+def fragmento(nome):
+    # Conta e cronometra cada execução de um fragmento (st.fragment)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registrar_execucao(nome, time.perf_counter() - inicio)
+
+
+@st.fragment(run_every=2)
+def painel_execucoes():
+    # Atualiza sozinho, já que reruns de fragmento não redesenham a sidebar
+    execucoes = st.session_state.get(CHAVE_EXECUCOES, {})
+    st.dataframe(pd.DataFrame.from_dict(execucoes, orient="index"))
+
+
+def admin_autorizado(parametro):
+    # Fecha por padrão: sem ANALISE_ADMIN_TOKEN definido o painel não abre
+    token = os.environ.get("ANALISE_ADMIN_TOKEN")
+    if not token or parametro is None:
+        return False
+    return hmac.compare_digest(parametro.encode(), token.encode())
+
+
+@st.fragment(run_every=5)
+def painel_recursos():
+    st.metric("Memória residente do processo (RSS)", f"{memoria.rss_bytes() / memoria.MB:,.1f} MB")
+
+    st.subheader("Caches limitados (compartilhados entre sessões)")
+    st.dataframe(pd.DataFrame.from_dict(
+        {nome: cache.estatisticas() for nome, cache in memoria.caches.items()}, orient="index"
+    ))
+
+    st.subheader("st.cache_data / st.cache_resource")
+    st.caption("O Streamlit só mede os bytes do st.cache_data; no st.cache_resource aparecem as entradas.")
+    st.dataframe(memoria.caches_streamlit(), hide_index=True)
+
+    st.subheader("Sessões")
+    st.caption("session_state no último rerun e soma do crescimento de RSS durante os reruns da sessão.")
+    st.dataframe(memoria.sessoes())
@@ -0,0 +1,106 @@
+"""Séries anuais de vendas por região, gênero e plataforma.
+
+O rollup é um array (anos x grupos x regiões) com as somas de vendas e a
+contagem de jogos, montado uma vez por versão do dataset. Todas as séries,
+médias móveis e variações anuais da seção Tendências saem dele, sem voltar
+às linhas. Jogos com ano "N/A" não entram na série; ficam somados à parte
+para a página informar quanto ficou de fora.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analise.dados import VENDAS
+
+DIMENSOES_TENDENCIA = {"Genre": "Gênero", "Platform": "Plataforma"}
+JANELA_PADRAO = 3
+# Todo jogo tem gênero, então os totais por ano saem da soma dos gêneros
+DIMENSAO_TOTAL = "Genre"
+
+
+@dataclass
+class Rollup:
+    """Somas por ano de cada dimensão.
+
+    - anos: todos os anos de min a max, inclusive os sem lançamentos.
+    - grupos[dim]: valores da dimensão, na ordem da 2ª coluna de vendas[dim].
+    - vendas[dim]: (anos, grupos, regiões em VENDAS); contagem[dim]: (anos, grupos).
+    - sem_ano[dim] / sem_ano_contagem[dim]: mesmas somas dos jogos com ano N/A.
+    """
+
+    anos: np.ndarray
+    grupos: dict
+    vendas: dict
+    contagem: dict
+    sem_ano: dict
+    sem_ano_contagem: dict
+
+
+def build_rollup(df):
+    anos = df["Year"].to_numpy(dtype="float64", na_value=np.nan)
+    com_ano = ~np.isnan(anos)
+    primeiro, ultimo = int(anos[com_ano].min()), int(anos[com_ano].max())
+    n_anos = ultimo - primeiro + 1
+    linha_ano = np.where(com_ano, anos - primeiro, n_anos).astype(np.intp)
+    vendas = df[VENDAS].to_numpy(dtype="float64")
+
+    rollup = Rollup(np.arange(primeiro, ultimo + 1), {}, {}, {}, {}, {})
+    for dimensao in DIMENSOES_TENDENCIA:
+        coluna = df[dimensao].astype("category")
+        codigos = coluna.cat.codes.to_numpy().astype(np.intp)
+        grupos = coluna.cat.categories.astype(str).tolist()
+        validos = codigos >= 0
+        # Uma linha extra (índice n_anos) acumula os jogos sem ano
+        celula = linha_ano[validos] * len(grupos) + codigos[validos]
+        tamanho = (n_anos + 1) * len(grupos)
+        somas = np.stack(
+            [np.bincount(celula, vendas[validos, j], minlength=tamanho) for j in range(len(VENDAS))],
+            axis=-1,
+        ).reshape(n_anos + 1, len(grupos), len(VENDAS))
+        contagem = np.bincount(celula, minlength=tamanho).reshape(n_anos + 1, len(grupos))
+
+        rollup.grupos[dimensao] = grupos
+        rollup.vendas[dimensao] = somas[:n_anos]
+        rollup.contagem[dimensao] = contagem[:n_anos]
+        rollup.sem_ano[dimensao] = somas[n_anos]
+        rollup.sem_ano_contagem[dimensao] = contagem[n_anos]
+    return rollup
+
+
+def serie_total(rollup, regioes=VENDAS):
+    """Vendas por ano (linhas) de cada região (colunas)."""
+    somas = rollup.vendas[DIMENSAO_TOTAL].sum(axis=1)
+    indices = [VENDAS.index(r) for r in regioes]
+    return pd.DataFrame(somas[:, indices], index=pd.Index(rollup.anos, name="Ano"), columns=list(regioes))
+
+
+def lancamentos(rollup):
+    return pd.Series(rollup.contagem[DIMENSAO_TOTAL].sum(axis=1), index=pd.Index(rollup.anos, name="Ano"),
+                     name="Lançamentos")
+
+
+def serie_por(rollup, dimensao, regiao, top=None):
+    """Vendas por ano de cada grupo da dimensão; com top, só os maiores no período."""
+    somas = rollup.vendas[dimensao][:, :, VENDAS.index(regiao)]
+    tabela = pd.DataFrame(somas, index=pd.Index(rollup.anos, name="Ano"), columns=rollup.grupos[dimensao])
+    ordem = tabela.sum().sort_values(ascending=False).index
+    return tabela[ordem[:top] if top else ordem]
+
+
+def media_movel(serie, janela=JANELA_PADRAO):
+    return serie.rolling(janela, min_periods=1).mean()
+
+
+def variacao_anual(serie):
+    # Em %; ano anterior sem vendas não tem variação definida
+    anterior = serie.shift(1)
+    return (serie - anterior).div(anterior.where(anterior != 0)) * 100
+
+
+def sem_ano(rollup, regiao="Global_Sales"):
+    """(jogos, vendas) dos registros com ano N/A."""
+    jogos = int(rollup.sem_ano_contagem[DIMENSAO_TOTAL].sum())
+    vendas = float(rollup.sem_ano[DIMENSAO_TOTAL][:, VENDAS.index(regiao)].sum())
+    return jogos, vendas
@@ -0,0 +1,319 @@
+"""Teste de carga: N sessões simuladas contra um servidor Streamlit local.
+
+Cada sessão fala o mesmo protocolo do navegador (websocket em
+/_stcore/stream, mensagens protobuf) e percorre em loop as páginas e os
+widgets da Análise, com uma pausa entre as interações. Os widgets dentro de
+fragmentos são reexecutados como fragmento, como no navegador.
+
+Para cada estágio (número de sessões) o relatório traz vazão de reruns,
+latência p50/p95/p99 (geral e por passo), bytes recebidos por rerun e as
+curvas de CPU e memória do processo do servidor.
+
+    python -m benchmarks.bench_carga                       # sobe o servidor sozinho
+    python -m benchmarks.bench_carga --sessoes 1 4 8 16 --duracao 60 --saida carga.json
+    python -m benchmarks.bench_carga --url ws://localhost:8501 --pid 1234
+
+O servidor é iniciado como no .devcontainer (streamlit run Home.py sem
+CORS/XSRF). CPU e memória vêm de /proc, então só são medidos no Linux.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PORTA = 8599
+TIMEOUT_RERUN = 120
+
+SECAO_1 = "1. Apresentação dos Dados"
+SECAO_2 = "2. Análise Inicial"
+SECAO_3 = "3. Distribuições Probabilísticas"
+SECAO_4 = "4. Conclusão Geral e Respostas às Perguntas Iniciais"
+SECAO_5 = "5. Tendências"
+
+# (nome do passo, ação): ("pagina", nome da página) ou (chave do widget, valor exibido)
+ROTEIRO = [
+    ("analise", ("pagina", "Análise")),
+    ("secao 2", ("secao", SECAO_2)),
+    ("regiao JP", ("regiao", "JP")),
+    ("regiao EU", ("regiao", "EU")),
+    ("secao 3", ("secao", SECAO_3)),
+    ("limiar 0.8", ("binomial_threshold", 0.8)),
+    ("limiar 1.5", ("binomial_threshold", 1.5)),
+    ("genero Action", ("normal_genre", "Action")),
+    ("secao 5", ("secao", SECAO_5)),
+    ("tendencia NA", ("tendencia_regiao", "NA")),
+    ("secao 4", ("secao", SECAO_4)),
+    ("secao 1", ("secao", SECAO_1)),
+    ("home", ("pagina", "")),
+    ("formacao", ("pagina", "Formação")),
+    ("skills", ("pagina", "Skills")),
+]
+
+# Como cada tipo de widget manda o valor de volta (igual ao AppTest)
+CAMPOS = {
+    "selectbox": "string_value",
+    "radio": "string_value",
+    "slider": "double_array_value",
+    "checkbox": "bool_value",
+    "multiselect": "string_array_value",
+    "text_input": "string_value",
+}
+
+
+class Sessao:
+    """Uma aba do navegador: um websocket e o estado dos widgets da página atual."""
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.pagina = "Análise"
+        self.widgets = {}  # chave -> (id, tipo, opções, fragment_id)
+        self.estados = {}  # id -> WidgetState
+
+    async def conectar(self):
+        self.ws = await websockets.connect(f"{self.url}/_stcore/stream", subprotocols=["streamlit"],
+                                           max_size=None)
+
+    async def fechar(self):
+        await self.ws.close()
+
+    async def executar(self, acao):
+        """Aplica a ação, espera o script_finished e devolve (segundos, bytes, erro)."""
+        chave, valor = acao
+        msg = BackMsg()
+        rerun = msg.rerun_script
+        if chave == "pagina":
+            self.pagina, self.widgets, self.estados = valor, {}, {}
+            rerun.page_name = valor
+        else:
+            id_, tipo, opcoes, fragmento = self.widgets[chave]
+            estado = WidgetState(id=id_)
+            campo = CAMPOS[tipo]
+            if campo == "double_array_value":
+                estado.double_array_value.data[:] = [valor]
+            elif campo == "string_array_value":
+                estado.string_array_value.data[:] = list(valor)
+            else:
+                setattr(estado, campo, valor)
+            self.estados[id_] = estado
+            rerun.page_name = self.pagina
+            if fragmento:
+                rerun.fragment_id = fragmento
+        rerun.widget_states.widgets.extend(self.estados.values())
+
+        inicio = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        recebidos, erro = 0, None
+        while True:
+            bruto = await asyncio.wait_for(self.ws.recv(), TIMEOUT_RERUN)
+            recebidos += len(bruto)
+            resposta = ForwardMsg()
+            resposta.ParseFromString(bruto)
+            tipo = resposta.WhichOneof("type")
+            if tipo == "delta":
+                erro = erro or self._registrar(resposta.delta)
+            elif tipo == "script_finished":
+                # 0 = script completo, 3 = fragmento; 2 = interrompido por outro rerun
+                if resposta.script_finished in (0, 3):
+                    return time.perf_counter() - inicio, recebidos, erro
+                if resposta.script_finished == 1:
+                    return time.perf_counter() - inicio, recebidos, "erro de compilação"
+
+    def _registrar(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return None
+        elemento = delta.new_element
+        tipo = elemento.WhichOneof("type")
+        if tipo == "exception":
+            return elemento.exception.message or elemento.exception.type
+        if tipo in CAMPOS:
+            widget = getattr(elemento, tipo)
+            # IDs de widgets com key terminam em "-<key>"
+            chave = widget.id.rsplit("-", 1)[-1]
+            self.widgets[chave] = (widget.id, tipo, list(getattr(widget, "options", [])), delta.fragment_id)
+        return None
+
+
+async def _usuario(url, fim, pausa, medicoes, atraso):
+    await asyncio.sleep(atraso)
+    sessao = Sessao(url)
+    await sessao.conectar()
+    try:
+        while time.perf_counter() < fim:
+            for passo, acao in ROTEIRO:
+                if time.perf_counter() >= fim:
+                    break
+                if acao[0] != "pagina" and acao[0] not in sessao.widgets:
+                    medicoes.append({"passo": passo, "tempo": None, "bytes": 0, "erro": "widget ausente",
+                                     "fim": time.perf_counter()})
+                    continue
+                try:
+                    tempo, recebidos, erro = await sessao.executar(acao)
+                except (asyncio.TimeoutError, websockets.ConnectionClosed) as exc:
+                    medicoes.append({"passo": passo, "tempo": None, "bytes": 0,
+                                     "erro": type(exc).__name__, "fim": time.perf_counter()})
+                    return
+                medicoes.append({"passo": passo, "tempo": tempo, "bytes": recebidos, "erro": erro,
+                                 "fim": time.perf_counter()})
+                await asyncio.sleep(random.uniform(0.5, 1.5) * pausa)
+    finally:
+        await sessao.fechar()
+
+
+class Monitor:
+    """Amostra CPU (%) e RSS (MB) de um processo pelo /proc."""
+
+    def __init__(self, pid, intervalo=0.5):
+        self.pid = pid
+        self.intervalo = intervalo
+        self.amostras = []
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._pagina = os.sysconf("SC_PAGE_SIZE")
+
+    def _ler(self):
+        with open(f"/proc/{self.pid}/stat") as arquivo:
+            campos = arquivo.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{self.pid}/statm") as arquivo:
+            rss = int(arquivo.read().split()[1]) * self._pagina
+        # utime + stime (campos 14 e 15 do stat; 12 e 13 depois do nome)
+        return (int(campos[11]) + int(campos[12])) / self._ticks, rss
+
+    async def rodar(self, fim):
+        if self.pid is None or not Path(f"/proc/{self.pid}").exists():
+            return
+        cpu_antes, _ = self._ler()
+        t_antes = time.perf_counter()
+        while time.perf_counter() < fim:
+            await asyncio.sleep(self.intervalo)
+            cpu, rss = self._ler()
+            agora = time.perf_counter()
+            self.amostras.append({"t": agora, "cpu_pct": 100 * (cpu - cpu_antes) / (agora - t_antes),
+                                  "rss_mb": rss / 2**20})
+            cpu_antes, t_antes = cpu, agora
+
+
+def _percentis(tempos):
+    if not tempos:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    p50, p95, p99 = np.percentile(np.array(tempos) * 1000, [50, 95, 99])
+    return {"p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)}
+
+
+async def estagio(url, n_sessoes, duracao, rampa, pausa, pid):
+    medicoes = []
+    inicio = time.perf_counter()
+    fim = inicio + rampa + duracao
+    monitor = Monitor(pid)
+    usuarios = [
+        _usuario(url, fim, pausa, medicoes, rampa * i / max(n_sessoes, 1))
+        for i in range(n_sessoes)
+    ]
+    await asyncio.gather(monitor.rodar(fim), *usuarios)
+
+    # Só o período com todas as sessões ativas entra na vazão e nos percentis
+    validas = [m for m in medicoes if m["tempo"] is not None and m["fim"] >= inicio + rampa]
+    por_passo = {}
+    for m in validas:
+        por_passo.setdefault(m["passo"], []).append(m["tempo"])
+    amostras = [a for a in monitor.amostras if a["t"] >= inicio + rampa]
+    return {
+        "sessoes": n_sessoes,
+        "reruns": len(validas),
+        "vazao_reruns_s": round(len(validas) / duracao, 2),
+        **_percentis([m["tempo"] for m in validas]),
+        "kb_por_rerun": round(np.mean([m["bytes"] for m in validas]) / 1024, 1) if validas else None,
+        "erros": [m["erro"] for m in medicoes if m["erro"]],
+        "cpu_medio_pct": round(np.mean([a["cpu_pct"] for a in amostras]), 1) if amostras else None,
+        "rss_max_mb": round(max(a["rss_mb"] for a in amostras), 1) if amostras else None,
+        "passos": {passo: _percentis(tempos) for passo, tempos in por_passo.items()},
+        "curvas": [{"t": round(a["t"] - inicio, 2), "cpu_pct": round(a["cpu_pct"], 1),
+                    "rss_mb": round(a["rss_mb"], 1)} for a in monitor.amostras],
+    }
+
+
+def iniciar_servidor(porta):
+    # Mesmos parâmetros do postAttachCommand do .devcontainer
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "Home.py", "--server.port", str(porta),
+         "--server.headless", "true", "--server.enableCORS", "false",
+         "--server.enableXsrfProtection", "false"],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(120):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1):
+                return processo
+        except OSError:
+            time.sleep(0.5)
+    processo.terminate()
+    raise RuntimeError("o servidor Streamlit não respondeu em 60s")
+
+
+def imprimir(resultados):
+    print(f"{'sessões':>7} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'KB/rerun':>9} {'CPU %':>6} {'RSS MB':>7} {'erros':>6}")
+    for r in resultados:
+        print(f"{r['sessoes']:>7} {r['vazao_reruns_s']:>9} {r['p50_ms'] or '-':>8} {r['p95_ms'] or '-':>8} "
+              f"{r['p99_ms'] or '-':>8} {r['kb_por_rerun'] or '-':>9} {r['cpu_medio_pct'] or '-':>6} "
+              f"{r['rss_max_mb'] or '-':>7} {len(r['erros']):>6}")
+    ultimo = resultados[-1]
+    print(f"\nPassos mais lentos com {ultimo['sessoes']} sessões (p95):")
+    lentos = sorted(ultimo["passos"].items(), key=lambda item: -(item[1]["p95_ms"] or 0))
+    for passo, tempos in lentos[:6]:
+        print(f"    {passo:<20} p50 {tempos['p50_ms']:>8} ms   p95 {tempos['p95_ms']:>8} ms")
+
+
+async def rodar(args):
+    resultados = []
+    for n in args.sessoes:
+        resultado = await estagio(args.url, n, args.duracao, args.rampa, args.pausa, args.pid)
+        resultados.append(resultado)
+        print(f"{n} sessões: {resultado['vazao_reruns_s']} reruns/s, p95 {resultado['p95_ms']} ms", flush=True)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 4, 8, 16],
+                        help="sessões simultâneas de cada estágio")
+    parser.add_argument("--duracao", type=float, default=30, help="segundos medidos por estágio")
+    parser.add_argument("--rampa", type=float, default=5, help="segundos para abrir todas as sessões")
+    parser.add_argument("--pausa", type=float, default=1.0, help="pausa média entre interações (s)")
+    parser.add_argument("--url", help="servidor já em execução (ex.: ws://localhost:8501)")
+    parser.add_argument("--pid", type=int, help="PID do servidor externo, para CPU/memória")
+    parser.add_argument("--saida", type=Path, help="grava o relatório (com as curvas) em JSON")
+    args = parser.parse_args()
+
+    servidor = None
+    if args.url is None:
+        servidor = iniciar_servidor(PORTA)
+        args.url, args.pid = f"ws://127.0.0.1:{PORTA}", servidor.pid
+    try:
+        resultados = asyncio.run(rodar(args))
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait()
+
+    print()
+    imprimir(resultados)
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compara os backends de consulta em datasets de tamanhos diferentes.
+
+Os datasets maiores são gerados reamostrando as linhas de vgsales.csv.
+
+    python -m benchmarks.bench_engines
+    python -m benchmarks.bench_engines --linhas 16598 1000000 --engines pandas duckdb
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analise.backends import criar_backend
+from analise.cubo import build_cubo
+from analise.dados import read_csv_typed
+
+TAMANHOS_PADRAO = [16_598, 1_000_000, 10_000_000]
+ENGINES = ["pandas", "duckdb", "polars"]
+LIMIARES = np.round(np.linspace(0.1, 2.0, 20), 2)
+
+
+def gerar_parquet(base, linhas, destino, seed=0):
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(base), linhas) if linhas != len(base) else np.arange(linhas)
+    base.iloc[indices].reset_index(drop=True).to_parquet(destino, index=False)
+    return destino
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(engine, parquet_path):
+    tempos = {}
+    if engine == "pandas":
+        df, tempos["carregar"] = cronometrar(lambda: pd.read_parquet(parquet_path))
+        backend, tempos["preparar"] = cronometrar(lambda: criar_backend(engine, df=df))
+    else:
+        tempos["carregar"] = 0.0
+        backend, tempos["preparar"] = cronometrar(lambda: criar_backend(engine, parquet_path=parquet_path))
+
+    _, tempos["cubo"] = cronometrar(lambda: build_cubo(backend))
+    _, total = cronometrar(lambda: [backend.contar_sucessos(limiar) for limiar in LIMIARES])
+    tempos["sucessos (por limiar)"] = total / len(LIMIARES)
+    _, tempos["filtro histograma"] = cronometrar(lambda: backend.valores("Global_Sales", abaixo_de=1))
+    _, tempos["filtro gênero"] = cronometrar(lambda: backend.valores("Global_Sales", genero="Platform"))
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, nargs="+", default=TAMANHOS_PADRAO)
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    args = parser.parse_args()
+
+    base = read_csv_typed()
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for linhas in args.linhas:
+            parquet_path = gerar_parquet(base, linhas, Path(pasta) / f"vgsales_{linhas}.parquet")
+            for engine in args.engines:
+                try:
+                    tempos = medir(engine, parquet_path)
+                except ImportError as erro:
+                    print(f"{engine}: não instalado ({erro})")
+                    continue
+                resultados.append({"linhas": linhas, "engine": engine, **tempos})
+                print(f"{linhas:>12,} {engine:<8} " + "  ".join(f"{k}={v * 1000:.1f}ms" for k, v in tempos.items()))
+
+    tabela = pd.DataFrame(resultados).set_index(["linhas", "engine"]) * 1000
+    print()
+    print("Tempos em milissegundos:")
+    print(tabela.round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
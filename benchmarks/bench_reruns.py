@@ -0,0 +1,210 @@
+"""Mede o tempo dos reruns de cada página com o AppTest do Streamlit.
+
+Cada cenário abre uma página e aplica uma sequência de interações
+(seção, região, limiar, gênero). Para cada passo são registrados o tempo
+total do rerun, o pico de memória alocada e os tempos por bloco que a
+página grava em st.session_state (ver analise/perfil.py). O passo "carga"
+é a primeira execução do script na sessão.
+
+Limitação: o AppTest não reexecuta só um fragmento; toda interação roda o
+script inteiro. Para os widgets que ficam num st.fragment, o relatório
+mostra também o tempo só do corpo do fragmento (registrado por
+perfil.fragmento), que é o que o navegador reexecuta. Para medir reruns de
+fragmento de ponta a ponta, use benchmarks/bench_carga.py.
+
+    python -m benchmarks.bench_reruns --saida antes.json
+    python -m benchmarks.bench_reruns --saida depois.json --comparar antes.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from analise.perfil import CHAVE_EXECUCOES, CHAVE_TEMPOS
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANALISE = "pages/4_Análise.py"
+TIMEOUT = 120
+
+SECAO_1 = "1. Apresentação dos Dados"
+SECAO_2 = "2. Análise Inicial"
+SECAO_3 = "3. Distribuições Probabilísticas"
+SECAO_4 = "4. Conclusão Geral e Respostas às Perguntas Iniciais"
+
+
+# Fragmento que o navegador reexecuta ao mudar cada widget
+FRAGMENTOS = {
+    "regiao": "Seção 2: região",
+    "binomial_threshold": "Seção 3: binomial",
+    "normal_genre": "Seção 3: normal",
+}
+
+
+def _selecionar(chave, valor):
+    interacao = lambda at: at.selectbox(key=chave).select(valor)
+    interacao.fragmento = FRAGMENTOS.get(chave)
+    return interacao
+
+
+def _slider(chave, valor):
+    interacao = lambda at: at.slider(key=chave).set_value(valor)
+    interacao.fragmento = FRAGMENTOS.get(chave)
+    return interacao
+
+
+# Cenário: (página, [(nome do passo, interação ou None para a carga inicial)])
+CENARIOS = {
+    "home": ("Home.py", [("carga", None)]),
+    "formacao": ("pages/2_Formação.py", [("carga", None)]),
+    "skills": ("pages/3_Skills.py", [("carga", None)]),
+    "analise_secoes": (ANALISE, [
+        ("carga", None),
+        ("secao 2", _selecionar("secao", SECAO_2)),
+        ("secao 3", _selecionar("secao", SECAO_3)),
+        ("secao 4", _selecionar("secao", SECAO_4)),
+        ("secao 1", _selecionar("secao", SECAO_1)),
+    ]),
+    "analise_regiao": (ANALISE, [
+        ("secao 2", _selecionar("secao", SECAO_2)),
+        *[(f"regiao {r}", _selecionar("regiao", r))
+          for r in ["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales", "Global_Sales"]],
+    ]),
+    "analise_limiar": (ANALISE, [
+        ("secao 3", _selecionar("secao", SECAO_3)),
+        *[(f"limiar {v}", _slider("binomial_threshold", v)) for v in [0.1, 0.25, 1.0, 1.5, 2.0]],
+    ]),
+    "analise_genero": (ANALISE, [
+        ("secao 3", _selecionar("secao", SECAO_3)),
+        *[(f"genero {g}", _selecionar("normal_genre", g))
+          for g in ["Action", "Sports", "Puzzle", "Shooter", "Platform"]],
+    ]),
+}
+
+
+def _medir_run(at):
+    tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    at.run()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    return duracao, pico
+
+
+def executar_cenario(pagina, passos):
+    at = AppTest.from_file(str(BASE_DIR / pagina), default_timeout=TIMEOUT)
+    resultados = []
+    # A primeira execução é a carga da página; só fica fora da medição nos
+    # cenários que começam direto por uma interação
+    primeira = _medir_run(at)
+    for nome, interacao in passos:
+        if interacao is None:
+            duracao, pico = primeira if not resultados else _medir_run(at)
+        else:
+            interacao(at)
+            duracao, pico = _medir_run(at)
+        if at.exception:
+            raise RuntimeError(f"{pagina} / {nome}: {at.exception[0].message}")
+        blocos = dict(at.session_state[CHAVE_TEMPOS]) if CHAVE_TEMPOS in at.session_state else {}
+        resultado = {"passo": nome, "tempo": duracao, "pico": pico, "blocos": blocos}
+        fragmento = getattr(interacao, "fragmento", None)
+        if fragmento:
+            execucoes = at.session_state[CHAVE_EXECUCOES] if CHAVE_EXECUCOES in at.session_state else {}
+            if fragmento in execucoes:
+                resultado["fragmento"] = execucoes[fragmento]["último (ms)"] / 1000
+        resultados.append(resultado)
+    return resultados
+
+
+def resumir(medicoes):
+    tempos = sorted(m["tempo"] for m in medicoes)
+    blocos = {}
+    for m in medicoes:
+        for bloco, duracao in m["blocos"].items():
+            blocos.setdefault(bloco, []).append(duracao)
+    resumo = {
+        "mediana_ms": statistics.median(tempos) * 1000,
+        "max_ms": tempos[-1] * 1000,
+        "pico_mb": max(m["pico"] for m in medicoes) / 2**20,
+        "blocos_ms": {b: statistics.median(v) * 1000 for b, v in blocos.items()},
+    }
+    fragmentos = [m["fragmento"] for m in medicoes if "fragmento" in m]
+    if fragmentos:
+        resumo["fragmento_ms"] = statistics.median(fragmentos) * 1000
+    return resumo
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def rodar(cenarios, repeticoes):
+    tracemalloc.start()
+    relatorio = {"commit": _commit_atual(), "python": platform.python_version(), "passos": {}}
+    medicoes = {}
+    for nome in cenarios:
+        pagina, passos = CENARIOS[nome]
+        for _ in range(repeticoes):
+            for resultado in executar_cenario(pagina, passos):
+                medicoes.setdefault(f"{nome} / {resultado['passo']}", []).append(resultado)
+    tracemalloc.stop()
+    relatorio["passos"] = {passo: resumir(m) for passo, m in medicoes.items()}
+    return relatorio
+
+
+def imprimir(relatorio, base=None, limite=0.10):
+    print(f"commit {relatorio['commit']} / Python {relatorio['python']}")
+    print("(o AppTest reexecuta o script inteiro a cada passo; \"fragmento\" é o tempo só do\n"
+          " fragmento que o navegador reexecutaria — ver benchmarks/bench_carga.py)")
+    regressoes = []
+    for passo, atual in relatorio["passos"].items():
+        linha = f"{passo:<45} {atual['mediana_ms']:>9.1f} ms  pico {atual['pico_mb']:>7.1f} MB"
+        anterior = (base or {}).get("passos", {}).get(passo)
+        if anterior:
+            variacao = atual["mediana_ms"] / anterior["mediana_ms"] - 1
+            linha += f"  ({variacao:+.0%} vs {anterior['mediana_ms']:.1f} ms)"
+            if variacao > limite:
+                regressoes.append(passo)
+                linha += "  <-- REGRESSÃO"
+        print(linha)
+        if "fragmento_ms" in atual:
+            print(f"    {'fragmento (rerun no navegador)':<41} {atual['fragmento_ms']:>9.1f} ms")
+        for bloco, duracao in sorted(atual["blocos_ms"].items(), key=lambda item: -item[1]):
+            print(f"    {bloco:<41} {duracao:>9.1f} ms")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenarios", nargs="+", default=list(CENARIOS), choices=list(CENARIOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", type=Path, help="grava o relatório em JSON")
+    parser.add_argument("--comparar", type=Path, help="relatório JSON de referência")
+    parser.add_argument("--limite", type=float, default=0.10,
+                        help="aumento relativo da mediana considerado regressão (padrão: 10%%)")
+    args = parser.parse_args()
+
+    relatorio = rodar(args.cenarios, args.repeticoes)
+    base = json.loads(args.comparar.read_text(encoding="utf-8")) if args.comparar else None
+    regressoes = imprimir(relatorio, base, args.limite)
+
+    if args.saida:
+        args.saida.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding="utf-8")
+    if regressoes:
+        raise SystemExit(f"{len(regressoes)} passo(s) com regressão acima de {args.limite:.0%}")
+
+
+if __name__ == "__main__":
+    main()
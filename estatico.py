@@ -0,0 +1,189 @@
+"""Pré-renderização das páginas só de texto em HTML estático.
+
+Home, Formação, Skills e as seções 1 e 4 da Análise não dependem de nenhum
+widget: cada visita só repete o mesmo script e a mesma ida e volta pelo
+websocket. Este build executa cada uma uma vez (com o AppTest do próprio
+Streamlit), converte os elementos em HTML e grava tudo em site/. O
+servidor.py entrega esses arquivos direto, e o runtime do Streamlit fica só
+com a parte interativa da Análise.
+
+    python -m estatico            # gera site/ (só se alguma fonte mudou)
+    python -m estatico --forcar
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import sys
+from pathlib import Path
+
+from markdown_it import MarkdownIt
+
+from analise.dados import dataset_version, escrever_atomico
+from analise.ingestao import listar_deltas, versao_completa
+
+BASE_DIR = Path(__file__).resolve().parent
+SITE_DIR = BASE_DIR / "site"
+MANIFESTO = SITE_DIR / "manifesto.json"
+SECAO_ANALISE = "4. Conclusão Geral e Respostas às Perguntas Iniciais"
+
+# arquivo gerado -> (título do menu, rota servida, script, seção da Análise)
+PAGINAS = {
+    "index.html": ("Home", "/", "Home.py", None),
+    "formacao.html": ("Formação", "/Formação", "pages/2_Formação.py", None),
+    "skills.html": ("Skills", "/Skills", "pages/3_Skills.py", None),
+    "analise-apresentacao.html": ("Análise: Apresentação", "/estatico/analise-apresentacao.html",
+                                  "pages/4_Análise.py", "1. Apresentação dos Dados"),
+    "analise-conclusao.html": ("Análise: Conclusão", "/estatico/analise-conclusao.html",
+                               "pages/4_Análise.py", SECAO_ANALISE),
+}
+# A parte interativa continua no Streamlit
+ROTA_ANALISE = "/Análise"
+
+# Mudou alguma destas fontes, algum módulo do pacote analise (ex.: o
+# bootstrap da seção 4) ou o dataset: refaz
+FONTES = ["Home.py", "pages/2_Formação.py", "pages/3_Skills.py", "pages/4_Análise.py",
+          "recursos.py", "foto.jpg", "estatico.py"]
+
+ESTILO = """
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #31333f; display: flex; }
+nav { width: 15rem; min-height: 100vh; background: #f0f2f6; padding: 2rem 1rem; box-sizing: border-box; }
+nav a { display: block; padding: .3rem .5rem; color: #31333f; text-decoration: none; border-radius: .3rem; }
+nav a.atual, nav a:hover { background: #dfe3eb; }
+nav p { margin-top: 2rem; font-size: .9rem; }
+main { flex: 1; max-width: 60rem; padding: 2rem 3rem; line-height: 1.6; }
+.sucesso { background: #dff5e3; color: #177233; padding: 1rem; border-radius: .5rem; }
+.legenda { color: #808495; font-size: .9rem; }
+table { border-collapse: collapse; font-size: .85rem; }
+th, td { border: 1px solid #e6e9ef; padding: .25rem .5rem; }
+"""
+
+_md = MarkdownIt("commonmark").enable("table")
+
+
+def _foto():
+    # Mesma miniatura 2x da versão Streamlit (WebP, ou JPEG sem suporte no Pillow)
+    from recursos import carregar_foto
+
+    foto = carregar_foto()[2]
+    return ("foto.webp" if foto[:4] == b"RIFF" else "foto.jpg"), foto
+
+
+def _hash_fontes():
+    sha = hashlib.sha256()
+    modulos = sorted(p.relative_to(BASE_DIR).as_posix() for p in (BASE_DIR / "analise").glob("*.py"))
+    for fonte in [*FONTES, *modulos]:
+        sha.update(fonte.encode())
+        sha.update((BASE_DIR / fonte).read_bytes())
+    versao_base = dataset_version()
+    sha.update(versao_completa(versao_base, listar_deltas(versao_base)).encode())
+    return sha.hexdigest()
+
+
+def atualizado():
+    try:
+        manifesto = json.loads(MANIFESTO.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return False
+    return manifesto.get("fontes") == _hash_fontes() and all((SITE_DIR / a).exists() for a in PAGINAS)
+
+
+def _elementos_em_html(no):
+    # Converte a árvore de elementos do AppTest; widgets não entram na versão estática
+    partes = []
+    for filho in getattr(no, "children", {}).values():
+        tipo = getattr(filho, "type", None)
+        if tipo == "title":
+            partes.append(f"<h1>{_md.renderInline(filho.value)}</h1>")
+        elif tipo == "header":
+            partes.append(f"<h2>{_md.renderInline(filho.value)}</h2>")
+        elif tipo == "subheader":
+            partes.append(f"<h3>{_md.renderInline(filho.value)}</h3>")
+        elif tipo == "markdown":
+            partes.append(_md.render(filho.value))
+        elif tipo == "caption":
+            partes.append(f'<p class="legenda">{_md.renderInline(filho.value)}</p>')
+        elif tipo == "success":
+            partes.append(f'<div class="sucesso">{_md.render(filho.value)}</div>')
+        elif tipo == "image":
+            partes.append(f'<img src="/estatico/{_foto()[0]}" width="100" alt="Foto">')
+        elif tipo == "dataframe":
+            partes.append(filho.value.to_html(float_format="{:.2f}".format, border=0))
+        elif tipo == "tab":
+            partes.append(f"<h4>{html.escape(filho.label)}</h4>")
+            partes.append(_elementos_em_html(filho))
+        elif tipo in ("tab_container", "vertical", "flex_container"):
+            partes.append(_elementos_em_html(filho))
+    return "\n".join(p for p in partes if p)
+
+
+def _menu(atual):
+    links = [
+        f'<a href="{rota}"{" class=atual" if arquivo == atual else ""}>{html.escape(titulo)}</a>'
+        for arquivo, (titulo, rota, _, _) in PAGINAS.items()
+    ]
+    links.append(f'<a href="{ROTA_ANALISE}">Análise interativa</a>')
+    return "\n".join(links)
+
+
+def renderizar(arquivo):
+    from streamlit.testing.v1 import AppTest
+
+    titulo, _, script, secao = PAGINAS[arquivo]
+    app = AppTest.from_file(str(BASE_DIR / script), default_timeout=300)
+    app.run()
+    if secao is not None:
+        app.selectbox(key="secao").select(secao).run()
+    if app.exception:
+        raise RuntimeError(f"{script}: {app.exception[0].message}")
+    rodape = "".join(
+        f"<p>{_md.renderInline(m.value)}</p>" for m in app.sidebar.markdown
+    )
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(titulo)}</title>
+<style>{ESTILO}</style>
+</head>
+<body>
+<nav>
+{_menu(arquivo)}
+{rodape}
+</nav>
+<main>
+{_elementos_em_html(app.main)}
+</main>
+</body>
+</html>
+"""
+
+
+def construir(forcar=False):
+    """Gera site/ a partir das páginas; não faz nada se as fontes não mudaram."""
+    if not forcar and atualizado():
+        return False
+    SITE_DIR.mkdir(exist_ok=True)
+    nome_foto, foto = _foto()
+    escrever_atomico(SITE_DIR / nome_foto, lambda p: p.write_bytes(foto))
+    for arquivo in PAGINAS:
+        pagina = renderizar(arquivo)
+        escrever_atomico(SITE_DIR / arquivo, lambda p: p.write_text(pagina, encoding="utf-8"))
+    manifesto = {"fontes": _hash_fontes(), "paginas": list(PAGINAS)}
+    escrever_atomico(MANIFESTO, lambda p: p.write_text(json.dumps(manifesto, indent=2), encoding="utf-8"))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--forcar", action="store_true", help="gera de novo mesmo sem mudanças")
+    args = parser.parse_args()
+    gerado = construir(args.forcar)
+    print(f"{len(PAGINAS)} páginas {'geradas' if gerado else 'já atualizadas'} em {SITE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
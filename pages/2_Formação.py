@@ -1,10 +1,12 @@
 import streamlit as st
 
+from recursos import mostrar_foto
+
 st.set_page_config(page_title="Formação Profissional/Experiências", layout="wide")
 st.sidebar.markdown("Feito por Felipe Megumi Nakama")
 
 # st.logo("")
-st.image("foto.jpg", width=100)
+mostrar_foto()
 
 st.title("Formação Profissional e Experiências")
 
@@ -1,41 +1,338 @@
+from dataclasses import replace
+from functools import partial, wraps
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-from scipy.stats import shapiro, norm, probplot
 
+from analise.artefatos import LIMIARES, carimbo_artefato, carregar_artefato
+from analise.backends import criar_backend, engine_configurada
+from analise.binomial import tabela_binomial
+from analise.busca import carregar_indice
+from analise.carregamento import importar_secao, tempos_importacao
+from analise.cubo import build_cubo, contagem_por, estatisticas, tabela_generos, tabela_plataformas
+from analise.dados import build_parquet, dataset_version, load_dataset
+from analise.ingestao import DatasetIncremental, listar_deltas, sincronizar, versao_completa
+from analise.exportar import FORMATOS, build_export, exportar_visao, rota_export
+from analise.filtros import DIMENSOES_FILTRO, Filtro, IndiceBitmap
+from analise.memoria import cache_dados, congelar
+from analise.perfil import (
+    admin_autorizado,
+    finalizar_rerun,
+    fragmento,
+    iniciar_rerun,
+    medir,
+    painel_execucoes,
+    painel_recursos,
+)
+from recursos import mostrar_foto
+
+# Bibliotecas pesadas de gráficos/estatística de cada seção; só são
+# importadas quando a seção é aberta pela primeira vez
+SECOES = {
+    "1. Apresentação dos Dados": [],
+    "2. Análise Inicial": ["analise.graficos", "analise.interativo"],
+    "3. Distribuições Probabilísticas": ["plotly.express", "analise.normalidade", "analise.graficos", "analise.interativo"],
+    "4. Conclusão Geral e Respostas às Perguntas Iniciais": ["analise.bootstrap"],
+    "5. Tendências": ["plotly.express", "analise.tendencias"],
+}
+
+# Tabelas pequenas ficam no st.cache_data; sem limite, cada limiar/filtro
+# novo ficaria na memória para sempre
+MAX_TABELAS = 256
+TTL_TABELAS = 3600
+# Intervalo mínimo (s) entre duas procuras por lotes novos em ingestao/
+INTERVALO_INGESTAO = 30
 
 
 # Configuração da página
 st.set_page_config(page_title="Análise de Vendas de Videogames", layout="wide")
 
-st.image("foto.jpg", width=100)
+# Página oculta de métricas do servidor: só abre com ?admin=<token>, e só
+# quando ANALISE_ADMIN_TOKEN estiver definido
+if admin_autorizado(st.query_params.get("admin")):
+    st.title("Métricas do Servidor")
+    painel_recursos()
+    st.stop()
+
+iniciar_rerun()
+
+mostrar_foto()
 
 st.title("Análise de Vendas de Videogames")
 
-# Carregar dados
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv("vgsales.csv", encoding="ISO-8859-1")
-    except UnicodeDecodeError:
-        df = pd.read_csv("vgsales.csv", encoding="Windows-1252")
-    return df
+# Dataset em memória (cache colunar em .cache/, invalidado pela versão do
+# CSV); os lotes de ingestão são aplicados nele de forma incremental
+@st.cache_resource(max_entries=2)
+def load_incremental(versao_base):
+    return DatasetIncremental(load_dataset())
+
+def dataset_atualizado(versao):
+    versao_base = versao.split("+")[0]
+    return load_incremental(versao_base).atualizar(listar_deltas(versao_base))
+
+# Cópia rasa do DataFrame compartilhado: os dados não são copiados, mas com
+# o copy-on-write do pandas 3 qualquer alteração no lugar (df.loc[...] = ...,
+# sort_values(inplace=True)) copia só o que mudou, e o original das outras
+# sessões fica intacto
+def load_data(versao):
+    return dataset_atualizado(versao).df.copy(deep=False)
+
+# Backend de consulta (pandas, DuckDB ou Polars), escolhido por ANALISE_ENGINE
+@st.cache_resource(max_entries=2)
+def load_backend(versao, engine):
+    if engine == "pandas":
+        return dataset_atualizado(versao).backend()
+    deltas = listar_deltas(versao.split("+")[0])
+    return criar_backend(engine, parquet_path=[build_parquet(), *deltas])
+
+# Objetos grandes de cada versão (cubo, grades, testes, bootstrap, rollup)
+# ficam no cache_dados: limitado por bytes, compartilhado e sem cópia por
+# sessão (ANALISE_CACHE_MB, padrão 256)
+
+def memorizar_artefato(nome):
+    """cache_dados.memorizar com o mtime do artefato na chave.
+
+    Assim um artefato gerado depois (python -m analise.artefatos) passa a
+    ser usado sem reiniciar o servidor, em vez de o cálculo sob demanda (ou
+    a falta do arquivo) ficar no cache para sempre.
+    """
+    def decorador(funcao):
+        @cache_dados.memorizar
+        @wraps(funcao)
+        def calcular(versao, carimbo, *args):
+            return funcao(versao, *args)
+
+        @wraps(funcao)
+        def envolvida(versao, *args):
+            return calcular(versao, carimbo_artefato(versao, nome), *args)
+        return envolvida
+    return decorador
 
-df = load_data()
+# Agregados da Seção 2, calculados uma vez por versão do dataset; no pandas o
+# cubo já é mantido pelo dataset incremental
+@memorizar_artefato("cubo")
+def load_cubo(versao, engine):
+    pre_calculado = carregar_artefato(versao, "cubo")
+    if pre_calculado is not None:
+        return pre_calculado
+    if engine == "pandas":
+        return dataset_atualizado(versao).cubo
+    return build_cubo(load_backend(versao, engine))
+
+# Opções do filtro cruzado, consultadas no backend (sem montar os bitmaps)
+@cache_dados.memorizar
+def load_opcoes_filtro(versao, engine):
+    backend = load_backend(versao, engine)
+    opcoes = {dimensao: [str(v) for v in backend.grupos(dimensao)] for dimensao in DIMENSOES_FILTRO}
+    opcoes["Year"] = [int(ano) for ano in backend.grupos("Year")]
+    return opcoes
+
+# Bitmaps do filtro cruzado, montados na primeira vez que um filtro é usado
+@st.cache_resource(max_entries=2)
+def load_indice_filtros(versao):
+    indice = IndiceBitmap(dataset_atualizado(versao).df)
+    congelar(vars(indice))
+    return indice
+
+@cache_dados.memorizar
+def load_cubo_filtrado(versao, filtro):
+    return load_indice_filtros(versao).cubo(filtro)
+
+def cubo_de(versao, engine, filtro):
+    if filtro.ativo():
+        return load_cubo_filtrado(versao, filtro)
+    return load_cubo(versao, engine)
+
+def valores_de(versao, engine, filtro, regiao, abaixo_de=None):
+    if filtro.ativo():
+        return load_indice_filtros(versao).valores_de(filtro, regiao, abaixo_de)
+    return load_backend(versao, engine).valores(regiao, abaixo_de=abaixo_de)
+
+def vendas_do_genero(versao, engine, filtro, genero):
+    if filtro.ativo():
+        return load_indice_filtros(versao).valores_de(replace(filtro, generos=(genero,)), "Global_Sales")
+    return load_backend(versao, engine).valores("Global_Sales", genero=genero)
+
+# Tabelas exibidas, em cache pelas entradas de que realmente dependem
+@st.cache_data(max_entries=MAX_TABELAS, ttl=TTL_TABELAS)
+def load_tabela_plataformas(versao, engine, filtro):
+    return tabela_plataformas(cubo_de(versao, engine, filtro))
+
+@st.cache_data(max_entries=MAX_TABELAS, ttl=TTL_TABELAS)
+def load_tabela_generos(versao, engine, regiao, filtro):
+    return tabela_generos(cubo_de(versao, engine, filtro), regiao)
+
+@memorizar_artefato("binomial")
+def load_grade_binomial(versao):
+    return carregar_artefato(versao, "binomial")
+
+@st.cache_data(max_entries=MAX_TABELAS, ttl=TTL_TABELAS)
+def load_binomial(versao, engine, limiar, filtro):
+    if filtro.ativo():
+        return tabela_binomial(*load_indice_filtros(versao).contar_sucessos(filtro, limiar))
+    grade = load_grade_binomial(versao)
+    if grade is not None and (grade["Limiar"] == round(limiar, 2)).any():
+        tabela = grade[grade["Limiar"] == round(limiar, 2)]
+        return tabela.drop(columns="Limiar").reset_index(drop=True)
+    return tabela_binomial(*load_backend(versao, engine).contar_sucessos(limiar))
+
+# Grade completa de limiares para o gráfico com slider no navegador
+@cache_dados.memorizar
+def load_grade_completa(versao, engine, filtro):
+    grade = None if filtro.ativo() else load_grade_binomial(versao)
+    if grade is not None:
+        return grade
+    import pandas as pd
+    if filtro.ativo():
+        indice = load_indice_filtros(versao)
+        contar = lambda limiar: indice.contar_sucessos(filtro, limiar)
+    else:
+        contar = load_backend(versao, engine).contar_sucessos
+    return pd.concat(
+        [tabela_binomial(*contar(limiar)).assign(Limiar=limiar) for limiar in LIMIARES],
+        ignore_index=True
+    )
+
+# Histogramas + KDE reduzidos de todas as regiões (só arrays pequenos vão ao navegador)
+@cache_dados.memorizar
+def load_distribuicoes(versao, engine, filtro):
+    from analise.interativo import distribuicao
+    return {
+        regiao: distribuicao(valores_de(versao, engine, filtro, regiao, abaixo_de=1) * 1_000_000)
+        for regiao in ["Global_Sales", "NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"]
+    }
+
+# Download da tabela exibida, dentro do próprio fragmento para acompanhar o widget
+def baixar_visao(nome, tabela):
+    st.download_button(
+        label="⬇️ Baixar tabela (CSV)",
+        data=exportar_visao(tabela, "CSV"),
+        file_name=f"{nome}.csv",
+        mime="text/csv"
+    )
+
+# Índice de busca de jogos, salvo em .cache/ e carregado uma vez por versão
+@st.cache_resource(max_entries=2)
+def load_busca(versao):
+    return carregar_indice(dataset_atualizado(versao).df, versao)
+
+# Arquivo de exportação do dataset completo, gerado uma vez por versão em
+# .cache/. Com o servidor.py ele é baixado direto do disco pela rota
+# /exportar; no `streamlit run` o download_button chama esta função só no
+# clique, fora do script
+def load_export(versao, formato):
+    return build_export(load_data(versao), versao, formato).read_bytes()
+
+# Testes de normalidade de todos os gêneros/plataformas/regiões
+@memorizar_artefato("normalidade")
+def load_normalidade(versao):
+    pre_calculado = carregar_artefato(versao, "normalidade")
+    if pre_calculado is not None:
+        return pre_calculado
+    from analise.normalidade import build_normalidade
+    return build_normalidade(load_data(versao))
+
+# Com o filtro cruzado ativo os testes são refeitos só sobre os jogos filtrados
+@cache_dados.memorizar
+def load_normalidade_filtrada(versao, engine, filtro, genero):
+    import numpy as np
+    from analise.dados import VENDAS
+    from analise.normalidade import testar_normalidade
+    # Mesma semente do build_normalidade para Global_Sales
+    rng = np.random.default_rng([0, VENDAS.index("Global_Sales")])
+    return testar_normalidade(vendas_do_genero(versao, engine, filtro, genero).to_numpy(), rng)
+
+# Intervalos bootstrap por gênero/plataforma (pré-calculados ou calculados uma vez por versão)
+@memorizar_artefato("bootstrap")
+def load_bootstrap(versao):
+    pre_calculado = carregar_artefato(versao, "bootstrap")
+    if pre_calculado is not None:
+        return pre_calculado
+    from analise.bootstrap import build_bootstrap
+    return build_bootstrap(load_data(versao))
+
+# Rollup ano x gênero/plataforma x região, base de toda a seção Tendências
+@memorizar_artefato("rollup")
+def load_rollup(versao):
+    pre_calculado = carregar_artefato(versao, "rollup")
+    if pre_calculado is not None:
+        return pre_calculado
+    from analise.tendencias import build_rollup
+    return build_rollup(load_data(versao))
+
+# Ingestão fora do caminho de cada rerun: no máximo uma vez por intervalo
+# no processo, e o cache_resource garante um único rerun ingerindo por vez
+@st.cache_resource(ttl=INTERVALO_INGESTAO, show_spinner=False)
+def sincronizar_periodico():
+    return len(sincronizar())
+
+with medir("dados"):
+    versao_base = dataset_version()
+    sincronizar_periodico()
+    versao_dados = versao_completa(versao_base, listar_deltas(versao_base))
+    engine = engine_configurada()
+    backend = load_backend(versao_dados, engine)
+
+# Busca de jogos por título ou publicadora; só este fragmento reexecuta a cada busca
+@st.fragment
+def bloco_busca():
+    with fragmento("Busca"):
+        consulta = st.text_input("🔎 Buscar jogo (título ou publicadora):", key="busca")
+        if not consulta:
+            return
+        dados = load_data(versao_dados)
+        with medir("busca"):
+            linhas = load_busca(versao_dados).buscar(consulta, dados["Global_Sales"].to_numpy())
+        if len(linhas) == 0:
+            st.write("Nenhum jogo encontrado.")
+            return
+        st.dataframe(
+            dados.iloc[linhas][["Name", "Platform", "Year", "Genre", "Publisher",
+                                "NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales", "Global_Sales"]],
+            hide_index=True
+        )
+
+bloco_busca()
 
 # Sidebar com seleção de seção
 with st.sidebar:
     st.header("Navegação")
     selected_section = st.selectbox(
         "Selecione a Seção:",
-        ["1. Apresentação dos Dados", 
-         "2. Análise Inicial", 
-         "3. Distribuições Probabilísticas",
-         "4. Conclusão Geral e Respostas às Perguntas Iniciais"]
+        list(SECOES),
+        key="secao"
     )
+    # Gráficos montados no navegador a partir de dados já agregados: trocar
+    # região/limiar não volta ao servidor
+    modo_cliente = st.toggle("Gráficos interativos (no navegador)", key="modo_cliente")
+
+    # Filtro cruzado: as tabelas e gráficos das Seções 2 e 3 passam a usar só
+    # os jogos que atendem a todas as dimensões escolhidas. As opções vêm do
+    # backend; os bitmaps só são montados quando algum filtro é usado
+    opcoes = load_opcoes_filtro(versao_dados, engine)
+    with st.expander("Filtro cruzado"):
+        primeiro_ano, ultimo_ano = opcoes["Year"][0], opcoes["Year"][-1]
+        anos = st.slider("Anos:", primeiro_ano, ultimo_ano, (primeiro_ano, ultimo_ano), key="filtro_anos")
+        anos = None if anos == (primeiro_ano, ultimo_ano) else anos
+        filtro = Filtro(
+            plataformas=tuple(st.multiselect("Plataformas:", opcoes["Platform"], key="filtro_plataformas")),
+            generos=tuple(st.multiselect("Gêneros:", opcoes["Genre"], key="filtro_generos")),
+            publishers=tuple(st.multiselect("Publicadoras:", opcoes["Publisher"], key="filtro_publishers")),
+            anos=anos,
+            # Só faz diferença quando a faixa de anos foi reduzida
+            incluir_sem_ano=st.checkbox("Incluir jogos sem ano", value=True, key="filtro_sem_ano") if anos else True,
+        )
+        if filtro.ativo():
+            indice_filtros = load_indice_filtros(versao_dados)
+            with medir("filtro"):
+                jogos_filtrados = len(indice_filtros.linhas(filtro))
+            if jogos_filtrados == 0:
+                st.warning("Nenhum jogo atende ao filtro; exibindo o dataset completo.")
+                filtro = Filtro()
+            else:
+                st.caption(f"{jogos_filtrados:,} de {indice_filtros.n:,} jogos".replace(",", "."))
+
+with medir("imports"):
+    importar_secao(selected_section, SECOES[selected_section])
 
 # Seção 1: Apresentação dos Dados
 if selected_section == "1. Apresentação dos Dados":
@@ -84,28 +381,30 @@ if selected_section == "1. Apresentação dos Dados":
 
 # Seção 2: Análise Inicial
 elif selected_section == "2. Análise Inicial":
+    from analise.graficos import (
+        cache_figuras,
+        grafico_distribuicao_regiao,
+        grafico_top_plataformas,
+    )
+
     st.header("2. Estatística Descritiva, Medidas Centrais e Análise Exploratória")
+    with medir("cubo"):
+        cubo = cubo_de(versao_dados, engine, filtro)
 
     # Estatísticas descritivas básicas
     st.write("### Estatísticas Descritivas das Vendas Globais")
-    st.write(df["Global_Sales"].describe())
+    st.write(estatisticas(cubo, "Global_Sales").drop(["mode", "var"]))
 
     # Contagem de jogos por gênero
     st.write("### Jogos por Gênero")
-    st.write(df["Genre"].value_counts())
+    st.write(contagem_por(cubo, "Genre"))
 
     # Correlação entre regiões
     st.write("### Correlação entre Vendas Regionais")
-    st.write(df[["NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales", "Global_Sales"]].corr())
+    st.write(cubo.correlacao)
 
     # Calcular vendas por plataforma
-    vendas_por_plataforma = df.groupby("Platform")["Global_Sales"].agg(["sum", "mean"]).reset_index()
-    vendas_por_plataforma.columns = ["Plataforma", "Vendas Totais (M)", "Vendas Médias (M)"]
-    vendas_por_plataforma = vendas_por_plataforma.sort_values("Vendas Totais (M)", ascending=False)
-    
-    # Formatando os valores
-    vendas_por_plataforma["Vendas Totais (M)"] = vendas_por_plataforma["Vendas Totais (M)"].round(2)
-    vendas_por_plataforma["Vendas Médias (M)"] = vendas_por_plataforma["Vendas Médias (M)"].round(2)
+    vendas_por_plataforma = load_tabela_plataformas(versao_dados, engine, filtro)
     
     # Exibir tabela
     st.write("### Vendas Globais por Plataforma")
@@ -120,18 +419,11 @@ elif selected_section == "2. Análise Inicial":
     # Gráfico de barras
     st.write("**Top 10 Plataformas por Vendas Totais**")
     top10_plataformas = vendas_por_plataforma.head(10)
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.barplot(
-        data=top10_plataformas,
-        x="Vendas Totais (M)",
-        y="Plataforma",
-        palette="viridis",
-        ax=ax
-    )
-    plt.xlabel("Vendas Totais (Milhões de Cópias)")
-    plt.ylabel("")
-    st.pyplot(fig)
+    with medir("grafico top plataformas"):
+        st.image(cache_figuras.renderizar(
+            ("top_plataformas", "Global_Sales", versao_dados, filtro),
+            lambda: grafico_top_plataformas(top10_plataformas)
+        ))
     
     # Discussão dos resultados
     st.write("""  
@@ -139,56 +431,74 @@ elif selected_section == "2. Análise Inicial":
     - **Vendas Médias**: Plataformas como GB (Game Boy) têm alta média por jogo, indicando catálogo enxuto e focado.   
     """)
 
-    # Dropdown para seleção de região
-    regiao = st.selectbox(
-        "Selecione a Região para Análise:",
-        ["Global_Sales", "NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"],
-        format_func=lambda x: x.replace("_", " ").replace("Sales", "").strip()
-    )
+    # No modo interativo a distribuição de todas as regiões vai numa figura só,
+    # e o menu da própria figura troca a região
+    if modo_cliente:
+        from analise.interativo import figura_distribuicoes
+
+        st.subheader("Distribuição das Vendas por Região (Valores < 1 Milhão)")
+        with medir("grafico distribuicao"):
+            st.plotly_chart(figura_distribuicoes(
+                load_distribuicoes(versao_dados, engine, filtro),
+                "Distribuição de Vendas por Jogo",
+                "Vendas (unidades)",
+                rotulo=lambda x: x.replace("_", " ").replace("Sales", "").strip()
+            ))
+
+    # Tudo abaixo depende só da região: trocar a região reexecuta apenas
+    # este fragmento, não as tabelas e gráficos acima
+    @st.fragment
+    def bloco_regiao():
+        with fragmento("Seção 2: região"):
+            # Dropdown para seleção de região
+            regiao = st.selectbox(
+                "Selecione a Região para Análise:",
+                ["Global_Sales", "NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"],
+                format_func=lambda x: x.replace("_", " ").replace("Sales", "").strip(),
+                key="regiao"
+            )
     
-    # Medidas centrais e dispersão
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader(f"Medidas Centrais")
-        st.write(f"Média: {df[regiao].mean():.2f}M")
-        st.write(f"Mediana: {df[regiao].median():.2f}M")
-        st.write(f"Moda: {df[regiao].mode()[0]:.2f}M")
+            # Medidas centrais e dispersão
+            medidas = estatisticas(cubo, regiao)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader(f"Medidas Centrais")
+                st.write(f"Média: {medidas['mean']:.2f}M")
+                st.write(f"Mediana: {medidas['50%']:.2f}M")
+                st.write(f"Moda: {medidas['mode']:.2f}M")
         
-    with col2:
-        st.subheader(f"Medidas de Dispersão")
-        st.write(f"Amplitude: {df[regiao].max() - df[regiao].min():.2f}M")
-        st.write(f"Variância: {df[regiao].var():.2f}")
-        st.write(f"Desvio Padrão: {df[regiao].std():.2f}M")
+            with col2:
+                st.subheader(f"Medidas de Dispersão")
+                st.write(f"Amplitude: {medidas['max'] - medidas['min']:.2f}M")
+                st.write(f"Variância: {medidas['var']:.2f}")
+                st.write(f"Desvio Padrão: {medidas['std']:.2f}M")
     
-    # Gráfico de distribuição (código atual)
-    st.subheader(f"Distribuição de {regiao.replace('_', ' ')} (Valores < 1 Milhão)")
-    vendas_filtradas = df[df[regiao] < 1][regiao] * 1_000_000
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.histplot(vendas_filtradas, bins=30, kde=True)
-    plt.gca().xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:,.0f}".replace(",", ".")))
-    plt.xlabel("Quantidade de Vendas (unidades)")
-    plt.ylabel("Frequência de Jogos")
-    st.pyplot(fig)
+            # Gráfico de distribuição (código atual)
+            if not modo_cliente:
+                st.subheader(f"Distribuição de {regiao.replace('_', ' ')} (Valores < 1 Milhão)")
+                with medir("grafico distribuicao"):
+                    st.image(cache_figuras.renderizar(
+                        ("distribuicao_regiao", regiao, versao_dados, filtro),
+                        lambda: grafico_distribuicao_regiao(valores_de(versao_dados, engine, filtro, regiao, abaixo_de=1) * 1_000_000)
+                    ))
     
-    # Tabela de vendas por gênero (código corrigido)
-    st.subheader(f"Vendas por Gênero")
-        
-    # Agrupar vendas por gênero e calcular total/média
-    vendas_por_genero = df.groupby("Genre")[regiao].agg(["sum", "mean"]).reset_index()
-    vendas_por_genero.columns = ["Gênero", "Total de Vendas (M)", "Média de Vendas (M)"]
+            # Tabela de vendas por gênero (código corrigido)
+            st.subheader(f"Vendas por Gênero")
         
-    # Formatando os valores para 2 casas decimais
-    vendas_por_genero["Total de Vendas (M)"] = vendas_por_genero["Total de Vendas (M)"].round(2)
-    vendas_por_genero["Média de Vendas (M)"] = vendas_por_genero["Média de Vendas (M)"].round(2)
+            # Agrupar vendas por gênero e calcular total/média
+            vendas_por_genero = load_tabela_generos(versao_dados, engine, regiao, filtro)
         
-    # Exibir tabela (CORREÇÃO AQUI)
-    st.dataframe(
-        vendas_por_genero.style.format({
-            "Total de Vendas (M)": "{:,.2f}",
-            "Média de Vendas (M)": "{:,.2f}"
-        }),
-        height=500
-    )
+            # Exibir tabela (CORREÇÃO AQUI)
+            st.dataframe(
+                vendas_por_genero.style.format({
+                    "Total de Vendas (M)": "{:,.2f}",
+                    "Média de Vendas (M)": "{:,.2f}"
+                }),
+                height=500
+            )
+            baixar_visao(f"vendas_por_genero_{regiao}", vendas_por_genero)
+
+    bloco_regiao()
     
     # Discussão Adicional
     st.subheader("Discussão dos Dados")
@@ -222,71 +532,74 @@ elif selected_section == "2. Análise Inicial":
     
 # Seção 3: Distribuições Probabilísticas
 elif selected_section == "3. Distribuições Probabilísticas":
+    import plotly.express as px
+    from analise.graficos import cache_figuras, grafico_normal_genero, grafico_qq
+
     st.header("3. Aplicação de Distribuições Probabilísticas")
     tab1, tab2 = st.tabs(["Análise Binomial", "Análise Normal"])
     
     with tab1:
         st.subheader("Distribuição Binomial: Probabilidade de Sucesso por Gênero")
+
+        # Modo interativo: a figura leva todos os limiares e o slider dela roda
+        # no navegador; o slider abaixo passa a controlar só a tabela
+        if modo_cliente:
+            from analise.interativo import figura_binomial
+
+            with medir("grafico binomial"):
+                st.plotly_chart(figura_binomial(load_grade_completa(versao_dados, engine, filtro)))
         
-        # Limiar ajustado para 0.5M (metade da média)
-        success_threshold = st.slider(
-            "Defina o limiar de sucesso (em milhões):",
-            0.1, 2.0, 0.5, key="binomial_threshold"
-        )
+        # Só este fragmento reexecuta ao arrastar o limiar
+        @st.fragment
+        def bloco_binomial():
+            with fragmento("Seção 3: binomial"):
+                # Limiar ajustado para 0.5M (metade da média)
+                success_threshold = st.slider(
+                    "Defina o limiar de sucesso (em milhões):",
+                    0.1, 2.0, 0.5, key="binomial_threshold"
+                )
         
-        # Cálculo da probabilidade de sucesso
-        binomial_data = []
-        for genre in df['Genre'].unique():
-            genre_df = df[df['Genre'] == genre]
-            n = len(genre_df)
-            k = len(genre_df[genre_df['Global_Sales'] >= success_threshold])
-            p = k / n if n > 0 else 0
-            
-            # Intervalo de confiança (95%)
-            z = norm.ppf(0.975)
-            se = np.sqrt(p * (1 - p)) / np.sqrt(n)
-            conf_int = (max(0, p - z*se), min(1, p + z*se))
-            
-            binomial_data.append({
-                "Gênero": genre,
-                "Probabilidade (%)": round(p * 100, 1),
-                "IC Inferior (%)": round(conf_int[0] * 100, 1),
-                "IC Superior (%)": round(conf_int[1] * 100, 1),
-                "Total de Jogos": n
-            })
+                # Cálculo da probabilidade de sucesso e intervalos de confiança (95%)
+                with medir("binomial"):
+                    binomial_df = load_binomial(versao_dados, engine, success_threshold, filtro)
         
-        binomial_df = pd.DataFrame(binomial_data)
+                # Destaque para Platform e Action
+                st.write("""
+                **Resultados Chave**:  
+                - **Gênero Platform**: Maior probabilidade de sucesso (média de vendas = 0.94M).  
+                - **Gênero Action**: Mais jogos lançados (3.316), mas probabilidade moderada de sucesso.  
+                - **Gênero Puzzle**: Baixo risco (menos jogos), mas baixa probabilidade de sucesso (< 17%).  
+                """)
         
-        # Destaque para Platform e Action
-        st.write("""
-        **Resultados Chave**:  
-        - **Gênero Platform**: Maior probabilidade de sucesso (média de vendas = 0.94M).  
-        - **Gênero Action**: Mais jogos lançados (3.316), mas probabilidade moderada de sucesso.  
-        - **Gênero Puzzle**: Baixo risco (menos jogos), mas baixa probabilidade de sucesso (< 17%).  
-        """)
-        
-        # Gráfico interativo
-        fig = px.bar(
-            binomial_df.sort_values("Probabilidade (%)", ascending=False),
-            x="Gênero",
-            y="Probabilidade (%)",
-            error_y="IC Superior (%)",
-            error_y_minus="IC Inferior (%)",
-            color="Total de Jogos",
-            title=f"Probabilidade de Vendas ≥ {success_threshold}M por Gênero"
-        )
-        st.plotly_chart(fig)
+                # Gráfico interativo
+                if not modo_cliente:
+                    with medir("grafico binomial"):
+                        fig = px.bar(
+                            binomial_df.sort_values("Probabilidade (%)", ascending=False),
+                            x="Gênero",
+                            y="Probabilidade (%)",
+                            error_y="IC Superior (%)",
+                            error_y_minus="IC Inferior (%)",
+                            color="Total de Jogos",
+                            title=f"Probabilidade de Vendas ≥ {success_threshold}M por Gênero"
+                        )
+                        st.plotly_chart(fig)
 
 
-        st.dataframe(
-            binomial_df.sort_values("Probabilidade (%)", ascending=False),
-            column_config={
-                "Probabilidade (%)": st.column_config.NumberColumn(format="%.1f%%"),
-                "IC Inferior (%)": st.column_config.NumberColumn(format="%.1f%%"),
-                "IC Superior (%)": st.column_config.NumberColumn(format="%.1f%%")
-            }
-        )
-         
+                st.dataframe(
+                    binomial_df.sort_values("Probabilidade (%)", ascending=False),
+                    column_config={
+                        "Probabilidade (%)": st.column_config.NumberColumn(format="%.1f%%"),
+                        "IC Inferior (%)": st.column_config.NumberColumn(format="%.1f%%"),
+                        "IC Superior (%)": st.column_config.NumberColumn(format="%.1f%%"),
+                        "IC Wilson Inferior (%)": st.column_config.NumberColumn(format="%.1f%%"),
+                        "IC Wilson Superior (%)": st.column_config.NumberColumn(format="%.1f%%")
+                    }
+                )
+                baixar_visao(f"binomial_{success_threshold}", binomial_df)
+
+        bloco_binomial()
+
         st.subheader("Justificativa da Escolha")
         st.write(f""" 
         A distribuição binomial foi usada para modelar a probabilidade de sucesso comercial de jogos por gênero, onde:
@@ -311,40 +624,69 @@ elif selected_section == "3. Distribuições Probabilísticas":
     with tab2:
         st.subheader("Distribuição Normal: Vendas Globais por Gênero")
         
-        # Foco em Platform (maior média)
-        selected_genre = st.selectbox(
-            "Selecione o Gênero:",
-            df['Genre'].unique(),
-            index=df['Genre'].unique().tolist().index("Platform"),  # Seleciona Platform por padrão
-            key="normal_genre"
-        )
+        # Só este fragmento reexecuta ao trocar o gênero
+        @st.fragment
+        def bloco_normal():
+            with fragmento("Seção 3: normal"):
+                # Foco em Platform (maior média); com filtro, só os gêneros filtrados
+                generos = [g for g in backend.grupos("Genre") if not filtro.generos or g in filtro.generos]
+                selected_genre = st.selectbox(
+                    "Selecione o Gênero:",
+                    generos,
+                    index=generos.index("Platform") if "Platform" in generos else 0,  # Seleciona Platform por padrão
+                    key="normal_genre"
+                )
         
-        genre_sales = df[df['Genre'] == selected_genre]['Global_Sales']
-        stat, p_value = shapiro(genre_sales)
+                genre_sales = vendas_do_genero(versao_dados, engine, filtro, selected_genre)
+                with medir("normalidade"):
+                    if filtro.ativo():
+                        testes, pontos_qq = load_normalidade_filtrada(versao_dados, engine, filtro, selected_genre)
+                    else:
+                        # Gêneros com menos de 8 jogos (ou vendas todas iguais) ficam fora dos testes
+                        normalidade, qq = load_normalidade(versao_dados)
+                        chave_testes = ("Genre", selected_genre, "Global_Sales")
+                        testes = normalidade.loc[chave_testes] if chave_testes in normalidade.index else None
+                        pontos_qq = qq.get(chave_testes)
+                if testes is None:
+                    st.info(f"O gênero {selected_genre} tem poucos jogos ({len(genre_sales)}) "
+                            "para testar a normalidade.")
+                    return
+                p_value = testes["shapiro_p"]
         
-        # Resultados do teste de normalidade
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("Teste de Shapiro-Wilk", 
-                     "Distribuição Normal" if p_value > 0.05 else "Não Normal",
-                     f"p-value = {p_value:.4f}")
+                # Resultados do teste de normalidade
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Teste de Shapiro-Wilk", 
+                             "Distribuição Normal" if p_value > 0.05 else "Não Normal",
+                             f"p-value = {p_value:.4f}")
+                    st.caption(f"Shapiro-Wilk: {testes['shapiro_metodo']} (n = {testes['n']})")
+
+                    st.write("**Outros Testes de Normalidade:**")
+                    st.write(f"D'Agostino K²: {testes['k2_stat']:.2f} (p-value = {testes['k2_p']:.4f})")
+                    st.write(f"Anderson-Darling: {testes['anderson_stat']:.2f} "
+                             f"(valor crítico a 5% = {testes['anderson_critico_5']:.3f})")
+                    st.write(f"Assimetria: {testes['assimetria']:.2f} | Curtose: {testes['curtose']:.2f}")
             
-            st.write("**Estatísticas Descritivas:**")
-            st.write(f"Média: {genre_sales.mean():.2f}M")
-            st.write(f"Mediana: {genre_sales.median():.2f}M")
-            st.write(f"Desvio Padrão: {genre_sales.std():.2f}M")
+                    st.write("**Estatísticas Descritivas:**")
+                    st.write(f"Média: {genre_sales.mean():.2f}M")
+                    st.write(f"Mediana: {genre_sales.median():.2f}M")
+                    st.write(f"Desvio Padrão: {genre_sales.std():.2f}M")
         
-        with col2:
-            # Gráfico com filtro de outliers (vendas < 5M)
-            sales_filtered = genre_sales[genre_sales < 5]
-            fig, ax = plt.subplots(figsize=(10, 6))
-            sns.histplot(sales_filtered, kde=True, stat='density', ax=ax)
-            xmin, xmax = ax.get_xlim()
-            x = np.linspace(xmin, xmax, 100)
-            ax.plot(x, norm.pdf(x, sales_filtered.mean(), sales_filtered.std()), 'r--', label='Normal Teórica')
-            plt.title(f"Distribuição de Vendas - {selected_genre} (Filtrado < 5M)")
-            plt.xlabel("Vendas Globais (Milhões)")
-            st.pyplot(fig)
+                with col2:
+                    # Gráfico com filtro de outliers (vendas < 5M)
+                    with medir("grafico normal"):
+                        st.image(cache_figuras.renderizar(
+                            ("normal_genero", selected_genre, versao_dados, filtro),
+                            lambda: grafico_normal_genero(genre_sales[genre_sales < 5], selected_genre)
+                        ))
+
+                    with st.expander("Gráfico Q-Q"):
+                        st.image(cache_figuras.renderizar(
+                            ("qq_genero", selected_genre, versao_dados, filtro),
+                            lambda: grafico_qq(pontos_qq, selected_genre)
+                        ))
+
+        bloco_normal()
 
         st.subheader("Justificativa da Escolha")
         st.write(f""" 
@@ -364,7 +706,7 @@ elif selected_section == "3. Distribuições Probabilísticas":
         """)
 
 # Seção 4: Conclusão Geral
-else:
+elif selected_section == "4. Conclusão Geral e Respostas às Perguntas Iniciais":
     st.header("4. Conclusão Geral e Respostas às Perguntas Iniciais")
     
     # Resposta às perguntas da Seção 1
@@ -416,6 +758,19 @@ else:
       - p-value < 0,001 para todos os gêneros → **dados não normais**.  
     """)
     
+    # Incerteza das médias, medianas, probabilidades e correlações citadas acima
+    from analise.bootstrap import DIMENSOES, N_REAMOSTRAS, tabela_intervalos
+
+    st.subheader("Intervalos de Confiança (Bootstrap)")
+    st.caption(f"Estimativa [IC 95%] a partir de {N_REAMOSTRAS} reamostras por grupo (vendas em milhões).")
+    with medir("bootstrap"):
+        bootstrap = load_bootstrap(versao_dados)
+    for aba, dimensao in zip(st.tabs(list(DIMENSOES.values())), DIMENSOES):
+        with aba:
+            intervalos = tabela_intervalos(bootstrap, dimensao)
+            st.dataframe(intervalos)
+            baixar_visao(f"bootstrap_{dimensao}", intervalos)
+
     st.subheader("Recomendações Estratégicas")
     st.write("""
     1. **Focar em NA e Plataforma/Shooter**:  
@@ -432,17 +787,103 @@ else:
     A presença de outliers exige abordagens diferenciadas, enquanto a correlação entre regiões oferece oportunidades de otimização de marketing. 
     """)
 
+# Seção 5: Tendências
+else:
+    import plotly.express as px
+    from analise.tendencias import (
+        DIMENSOES_TENDENCIA,
+        JANELA_PADRAO,
+        lancamentos,
+        media_movel,
+        serie_por,
+        serie_total,
+        sem_ano,
+        variacao_anual,
+    )
+
+    st.header("5. Tendências das Vendas ao Longo dos Anos")
+    with medir("rollup"):
+        rollup = load_rollup(versao_dados)
+
+    jogos_sem_ano, vendas_sem_ano = sem_ano(rollup)
+    st.caption(f"{jogos_sem_ano} jogos com ano N/A ({vendas_sem_ano:.2f}M em vendas globais) "
+               "ficam fora das séries anuais. Os últimos anos do dataset têm poucos registros.")
+
+    # Totais por região e lançamentos por ano
+    st.write("### Vendas por Ano e Região")
+    st.plotly_chart(px.line(
+        serie_total(rollup).round(2),
+        labels={"value": "Vendas (M)", "variable": "Região"},
+    ))
+    st.write("### Jogos Lançados por Ano")
+    st.bar_chart(lancamentos(rollup))
+
+    # Só este fragmento reexecuta ao trocar região, dimensão ou janela
+    @st.fragment
+    def bloco_tendencias():
+        with fragmento("Seção 5: tendências"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                regiao = st.selectbox(
+                    "Região:",
+                    ["Global_Sales", "NA_Sales", "EU_Sales", "JP_Sales", "Other_Sales"],
+                    format_func=lambda x: x.replace("_", " ").replace("Sales", "").strip(),
+                    key="tendencia_regiao"
+                )
+            with col2:
+                dimensao = st.radio("Agrupar por:", list(DIMENSOES_TENDENCIA),
+                                    format_func=DIMENSOES_TENDENCIA.get, horizontal=True,
+                                    key="tendencia_dimensao")
+            with col3:
+                janela = st.slider("Média móvel (anos):", 1, 7, JANELA_PADRAO, key="tendencia_janela")
+            top = st.slider("Quantidade de grupos:", 3, 12, 5, key="tendencia_top")
+
+            serie = serie_por(rollup, dimensao, regiao, top=top)
+            nome = DIMENSOES_TENDENCIA[dimensao]
+            st.subheader(f"{regiao.replace('_', ' ')} por {nome} (média móvel de {janela} anos)")
+            st.plotly_chart(px.line(
+                media_movel(serie, janela).round(2),
+                labels={"value": "Vendas (M)", "variable": nome},
+            ))
+
+            st.subheader("Variação Anual (%)")
+            variacao = variacao_anual(serie).round(1)
+            st.dataframe(variacao.dropna(how="all").sort_index(ascending=False), height=400)
+            baixar_visao(f"variacao_anual_{dimensao}_{regiao}", variacao)
+
+    bloco_tendencias()
+
 # Botão para download
 with st.sidebar:
     st.divider()
     if st.button("Baixar Dataset Completo"):
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="⬇️ Download CSV",
-            data=csv,
-            file_name='vgsales_completo.csv',
-            mime='text/csv'
-        )
+        st.session_state["mostrar_download"] = True
+
+    if st.session_state.get("mostrar_download"):
+        formato = st.selectbox("Formato:", list(FORMATOS), key="formato_download")
+        extensao, mime = FORMATOS[formato]
+        rota = rota_export(formato)
+        if rota is not None:
+            st.link_button(f"⬇️ Download {extensao.upper()}", rota)
+        else:
+            st.download_button(
+                label=f"⬇️ Download {extensao.upper()}",
+                data=partial(load_export, versao_dados, formato),
+                file_name=f"vgsales_completo.{extensao}",
+                mime=mime
+            )
+
+# Tempos de importação e execuções por fragmento (abrir a página com ?debug=1)
+if "debug" in st.query_params:
+    with st.sidebar.expander("Tempo de importação"):
+        for secao, modulos in tempos_importacao.items():
+            st.write(f"**{secao}**")
+            for modulo, duracao in modulos.items():
+                st.write(f"- {modulo}: {duracao * 1000:.0f} ms")
+    with st.sidebar.expander("Execuções"):
+        painel_execucoes()
 
 st.sidebar.divider()  # Adiciona uma linha para separar visualmente
-st.sidebar.markdown("Feito por Felipe Megumi Nakama")  # Texto alinhado abaixo de tudo
\ No newline at end of file
+st.sidebar.markdown("Feito por Felipe Megumi Nakama")  # Texto alinhado abaixo de tudo
+
+finalizar_rerun()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import io
+from pathlib import Path
+
+import streamlit as st
+from PIL import Image, features
+
+FOTO_PATH = Path(__file__).resolve().parent / "foto.jpg"
+FOTO_LARGURA = 100
+
+
+def _miniatura(imagem, largura, formato):
+    altura = round(imagem.height * largura / imagem.width)
+    reduzida = imagem.resize((largura, altura), Image.LANCZOS)
+    buffer = io.BytesIO()
+    reduzida.save(buffer, format=formato, quality=85)
+    return buffer.getvalue()
+
+
+@st.cache_resource
+def carregar_foto():
+    """Lê foto.jpg uma vez por processo e gera as miniaturas 1x e 2x.
+
+    Retorna {escala: bytes}, em WebP quando o Pillow tem suporte e em JPEG
+    caso contrário.
+    """
+    formato = "WEBP" if features.check("webp") else "JPEG"
+    with Image.open(FOTO_PATH) as imagem:
+        imagem = imagem.convert("RGB")
+        return {
+            escala: _miniatura(imagem, FOTO_LARGURA * escala, formato)
+            for escala in (1, 2)
+        }
+
+
+def mostrar_foto():
+    # A versão 2x exibida a 100 px fica nítida em telas de alta densidade e
+    # ainda é bem menor que o JPEG original
+    st.image(carregar_foto()[2], width=FOTO_LARGURA)
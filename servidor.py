@@ -0,0 +1,87 @@
+"""Servidor ASGI: páginas de texto pré-renderizadas + Streamlit para a Análise.
+
+As rotas de Home, Formação e Skills devolvem o HTML gerado por estatico.py
+(sem executar script nem abrir websocket), e as seções 1 e 4 da Análise
+ficam em /estatico/. O dataset completo é baixado por /exportar/<extensão>,
+lido do disco em partes, sem passar pela memória do script. O resto, inclusive /Análise, continua com o runtime
+do Streamlit.
+
+    uvicorn servidor:app --port 8501
+
+O `streamlit run Home.py` de sempre continua funcionando, só sem as rotas
+estáticas.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import FileResponse, HTMLResponse, PlainTextResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+import estatico
+from analise import exportar
+
+# As páginas estáticas mudam só quando o build roda de novo
+CACHE_CONTROL = "public, max-age=300"
+
+_paginas = {}
+
+
+def preparar():
+    """Gera site/ se alguma página ou o dataset mudou e carrega as páginas.
+
+    O build roda em outro processo, para o AppTest dele não dividir o
+    runtime com o servidor.
+    """
+    if not estatico.atualizado():
+        subprocess.run([sys.executable, "-m", "estatico"], cwd=estatico.BASE_DIR, check=True)
+    _paginas.update(
+        (rota, (estatico.SITE_DIR / arquivo).read_text(encoding="utf-8"))
+        for arquivo, (_, rota, _, _) in estatico.PAGINAS.items()
+        if not rota.startswith("/estatico/")
+    )
+
+
+@asynccontextmanager
+async def _ciclo_de_vida(app):
+    # Na inicialização do servidor, não na importação do módulo
+    await asyncio.to_thread(preparar)
+    yield
+
+
+def _servir(rota):
+    async def responder(request):
+        return HTMLResponse(_paginas[rota], headers={"Cache-Control": CACHE_CONTROL})
+
+    return responder
+
+
+async def _exportar(request):
+    extensao = request.path_params["extensao"]
+    formato = next((f for f, (e, _) in exportar.FORMATOS.items() if e == extensao), None)
+    if formato is None:
+        return PlainTextResponse("Formato desconhecido", status_code=404)
+    # Gerado uma vez por versão, numa thread, fora do script do Streamlit
+    caminho = await asyncio.to_thread(exportar.export_atual, formato)
+    _, mime = exportar.FORMATOS[formato]
+    return FileResponse(caminho, media_type=mime, filename=f"vgsales_completo.{extensao}")
+
+
+# A página de Análise passa a linkar para a rota em vez de gerar o download
+os.environ[exportar.VARIAVEL_ROTA] = exportar.ROTA
+
+ROTAS = [rota for _, rota, _, _ in estatico.PAGINAS.values() if not rota.startswith("/estatico/")]
+
+app = st.App(
+    "Home.py",
+    lifespan=_ciclo_de_vida,
+    routes=[Route(rota, _servir(rota)) for rota in ROTAS]
+    + [Route(f"{exportar.ROTA}/{{extensao}}", _exportar)]
+    # site/ só existe depois do build da inicialização
+    + [Mount("/estatico", StaticFiles(directory=estatico.SITE_DIR, check_dir=False))],
+)
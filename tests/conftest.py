@@ -0,0 +1,8 @@
+import pytest
+
+from analise.dados import load_dataset
+
+
+@pytest.fixture(scope="session")
+def df():
+    return load_dataset()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise.backends import PandasBackend, criar_backend
+from analise.binomial import contar_sucessos, ordenar_por_grupo, tabela_binomial
+from analise.cubo import build_cubo, tabela_generos, tabela_plataformas, vendas_por
+from analise.dados import VENDAS, build_parquet
+
+
+@pytest.fixture(scope="module", params=["pandas", "duckdb", "polars"])
+def backend(request, df):
+    if request.param == "pandas":
+        return PandasBackend(df)
+    return criar_backend(request.param, parquet_path=build_parquet())
+
+
+def test_celulas_somam_como_groupby(backend, df):
+    cubo = build_cubo(backend)
+    for dimensao in ["Platform", "Genre"]:
+        for regiao in VENDAS:
+            esperado = df[regiao].astype("float64").groupby(df[dimensao].astype(str)).agg(["sum", "mean"])
+            obtido = vendas_por(cubo, dimensao, regiao).set_index(dimensao)
+            pd.testing.assert_frame_equal(obtido.astype("float64"), esperado, check_names=False,
+                                          check_index_type=False, rtol=1e-6)
+
+
+def test_tabelas_da_secao_2(backend, df):
+    cubo = build_cubo(backend)
+    plataformas = tabela_plataformas(cubo).set_index("Plataforma")
+    esperado = df["Global_Sales"].astype("float64").groupby(df["Platform"].astype(str)).sum()
+    assert plataformas.index[0] == esperado.idxmax()
+    np.testing.assert_allclose(plataformas["Vendas Totais (M)"], esperado.loc[plataformas.index], atol=0.01)
+
+    generos = tabela_generos(cubo, "JP_Sales").set_index("Gênero")
+    esperado = df["JP_Sales"].astype("float64").groupby(df["Genre"].astype(str)).mean()
+    np.testing.assert_allclose(generos["Média de Vendas (M)"], esperado.loc[generos.index], atol=0.01)
+
+
+def test_resumo_e_correlacao(backend, df):
+    cubo = build_cubo(backend)
+    vendas = df[VENDAS].astype("float64")
+    descritas = vendas.describe()
+    pd.testing.assert_frame_equal(cubo.resumo.loc[descritas.index], descritas, rtol=1e-6)
+    pd.testing.assert_frame_equal(cubo.correlacao, vendas.corr(), rtol=1e-6, check_names=False)
+
+
+# Limiares com empates exatos (0.5, 1.0) e entre valores
+@pytest.mark.parametrize("limiar", [0.1, 0.5, 0.55, 1.0, 2.0])
+def test_contagem_de_sucessos(backend, df, limiar):
+    generos, n, k = backend.contar_sucessos(limiar)
+    globais = df["Global_Sales"].astype("float32")
+    esperado = (globais >= np.float32(limiar)).groupby(df["Genre"].astype(str)).agg(["size", "sum"])
+    assert list(generos) == list(esperado.index)
+    np.testing.assert_array_equal(n, esperado["size"])
+    np.testing.assert_array_equal(k, esperado["sum"])
+
+
+def test_tabela_binomial(df):
+    ordenadas = ordenar_por_grupo(df, "Genre", "Global_Sales")
+    tabela = tabela_binomial(ordenadas.grupos, ordenadas.tamanhos, contar_sucessos(ordenadas, 0.5))
+    sucesso = (df["Global_Sales"] >= 0.5).groupby(df["Genre"].astype(str)).mean() * 100
+    np.testing.assert_allclose(tabela.set_index("Gênero")["Probabilidade (%)"], sucesso.round(1), atol=0.05)
+    assert (tabela["IC Inferior (%)"] <= tabela["Probabilidade (%)"]).all()
+    assert (tabela["Probabilidade (%)"] <= tabela["IC Superior (%)"]).all()
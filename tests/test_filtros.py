@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise.dados import VENDAS
+from analise.filtros import Filtro, IndiceBitmap
+
+FILTROS = [
+    Filtro(),
+    Filtro(plataformas=("PS2", "Wii"), generos=("Action", "Sports")),
+    Filtro(publishers=("Nintendo",), anos=(1990, 2005)),
+    Filtro(anos=(2000, 2005), incluir_sem_ano=False),
+    Filtro(generos=("Puzzle",), anos=(2010, 2020)),
+    Filtro(plataformas=("Inexistente",)),
+]
+
+
+@pytest.fixture(scope="module")
+def indice(df):
+    return IndiceBitmap(df)
+
+
+def _mascara(df, filtro):
+    # Mesmo filtro escrito direto com pandas
+    mascara = pd.Series(True, index=df.index)
+    for coluna, escolhidos in [("Platform", filtro.plataformas), ("Genre", filtro.generos),
+                               ("Publisher", filtro.publishers)]:
+        if escolhidos:
+            mascara &= df[coluna].astype(str).isin(escolhidos)
+    if filtro.anos is not None:
+        faixa = df["Year"].between(*filtro.anos).fillna(False).astype(bool)
+        if filtro.incluir_sem_ano:
+            faixa |= df["Year"].isna()
+        mascara &= faixa
+    return mascara.to_numpy()
+
+
+def _celulas(df):
+    vendas = df[VENDAS].astype("float64")
+    chaves = [df["Platform"].astype(str), df["Genre"].astype(str)]
+    celulas = pd.concat([
+        vendas.groupby(chaves).size().rename("count"),
+        vendas.groupby(chaves).sum().add_suffix("_sum"),
+        (vendas ** 2).groupby(chaves).sum().add_suffix("_sumsq"),
+    ], axis=1)
+    return celulas.sort_index()
+
+
+@pytest.mark.parametrize("filtro", FILTROS)
+def test_linhas_iguais_ao_filtro_pandas(indice, df, filtro):
+    np.testing.assert_array_equal(indice.linhas(filtro), np.flatnonzero(_mascara(df, filtro)))
+
+
+@pytest.mark.parametrize("filtro", FILTROS[:-1])
+def test_cubo_filtrado_igual_ao_groupby(indice, df, filtro):
+    filtrado = df[_mascara(df, filtro)]
+    cubo = indice.cubo(filtro)
+    pd.testing.assert_frame_equal(cubo.celulas.sort_index(), _celulas(filtrado),
+                                  check_dtype=False, check_names=False, rtol=1e-6)
+    vendas = filtrado[VENDAS].astype("float64")
+    pd.testing.assert_frame_equal(cubo.correlacao, vendas.corr(), rtol=1e-6)
+    np.testing.assert_allclose(cubo.resumo.loc["mean"], vendas.mean(), rtol=1e-6)
+
+
+@pytest.mark.parametrize("filtro", FILTROS[:-1])
+@pytest.mark.parametrize("limiar", [0.5, 1.0])
+def test_sucessos_filtrados(indice, df, filtro, limiar):
+    filtrado = df[_mascara(df, filtro)]
+    sucesso = filtrado["Global_Sales"].astype("float32") >= np.float32(limiar)
+    esperado = sucesso.groupby(filtrado["Genre"].astype(str)).agg(["size", "sum"])
+    generos, n, k = indice.contar_sucessos(filtro, limiar)
+    assert sorted(generos) == list(esperado.index)
+    ordem = np.argsort(generos)
+    np.testing.assert_array_equal(n[ordem], esperado["size"])
+    np.testing.assert_array_equal(k[ordem], esperado["sum"])
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise.dados import CATEGORICAS, VENDAS
+from analise.ingestao import DatasetIncremental
+
+
+def _parte(df, inicio, fim):
+    # Fatia com só as categorias presentes, como um lote lido do CSV
+    parte = df.iloc[inicio:fim].reset_index(drop=True)
+    for coluna in CATEGORICAS:
+        parte[coluna] = parte[coluna].cat.remove_unused_categories()
+    return parte
+
+
+def _com_novidades(parte):
+    # Gênero e plataforma que a base não conhece
+    parte = parte.copy()
+    for coluna, valor in [("Genre", "Sandbox"), ("Platform", "Switch")]:
+        valores = parte[coluna].astype(str)
+        valores.iloc[:5] = valor
+        parte[coluna] = valores.astype("category")
+    return parte
+
+
+@pytest.fixture(scope="module")
+def lotes(df, tmp_path_factory):
+    pasta = tmp_path_factory.mktemp("deltas")
+    partes = [_parte(df, 15000, 15800), _com_novidades(_parte(df, 15800, len(df)))]
+    caminhos = []
+    for i, parte in enumerate(partes, start=1):
+        caminhos.append(pasta / f"{i:06d}.parquet")
+        parte.to_parquet(caminhos[-1])
+    return partes, caminhos
+
+
+@pytest.fixture(scope="module")
+def incremental(df, lotes):
+    _, caminhos = lotes
+    return DatasetIncremental(_parte(df, 0, 15000)).atualizar(caminhos)
+
+
+@pytest.fixture(scope="module")
+def completo(df, lotes):
+    # Recalculado do zero: base e lotes concatenados como texto
+    partes, _ = lotes
+    return pd.concat([df.iloc[:15000].astype({c: str for c in CATEGORICAS}),
+                      *[p.astype({c: str for c in CATEGORICAS}) for p in partes]], ignore_index=True)
+
+
+def test_linhas_e_categorias(incremental, completo):
+    assert len(incremental.df) == len(completo)
+    for coluna in CATEGORICAS:
+        assert isinstance(incremental.df[coluna].dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(incremental.df[coluna].astype(str), completo[coluna])
+
+
+def test_celulas_iguais_ao_recalculo(incremental, completo):
+    vendas = completo[VENDAS].astype("float64")
+    chaves = [completo["Platform"], completo["Genre"]]
+    esperado = pd.concat([
+        vendas.groupby(chaves).size().rename("count"),
+        vendas.groupby(chaves).sum().add_suffix("_sum"),
+        (vendas ** 2).groupby(chaves).sum().add_suffix("_sumsq"),
+    ], axis=1)
+    pd.testing.assert_frame_equal(incremental.cubo.celulas.sort_index(), esperado.sort_index(),
+                                  check_dtype=False, check_names=False, rtol=1e-9)
+
+
+def test_momentos_resumo_e_correlacao(incremental, completo):
+    vendas = completo[VENDAS].astype("float64")
+    assert incremental.momentos["n"] == len(completo)
+    pd.testing.assert_frame_equal(incremental.cubo.correlacao, vendas.corr(), rtol=1e-9, check_names=False)
+    descritas = vendas.describe()
+    pd.testing.assert_frame_equal(incremental.cubo.resumo.loc[descritas.index], descritas, rtol=1e-9)
+    np.testing.assert_allclose(incremental.cubo.resumo.loc["var"], vendas.var(), rtol=1e-9)
+    np.testing.assert_allclose(incremental.cubo.resumo.loc["mode"], vendas.mode().iloc[0])
+
+
+def test_vendas_ordenadas_por_genero(incremental, completo):
+    ordenadas = incremental.ordenadas
+    assert list(ordenadas.grupos) == sorted(completo["Genre"].unique())
+    for grupo, inicio, tamanho in zip(ordenadas.grupos, ordenadas.inicios, ordenadas.tamanhos):
+        esperado = np.sort(completo.loc[completo["Genre"] == grupo, "Global_Sales"].to_numpy("float32"))
+        np.testing.assert_array_equal(ordenadas.valores[inicio:inicio + tamanho], esperado)
+
+
+def test_atualizar_so_aplica_lotes_novos(incremental, lotes):
+    _, caminhos = lotes
+    n = len(incremental.df)
+    incremental.atualizar(caminhos)
+    assert len(incremental.df) == n
+    assert incremental.aplicados == caminhos
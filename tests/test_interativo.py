@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+
+from analise.interativo import BINS, distribuicao
+
+
+@pytest.mark.parametrize("n", [5, 35, 500])
+def test_kde_acompanha_gaussian_kde(n):
+    # Grupos pequenos (ex.: filtro cruzado) têm kernel mais largo que a grade
+    valores = np.random.default_rng(n).lognormal(11, 1, n)
+    dados = distribuicao(valores)
+    largura = (dados["bordas"][-1] - dados["bordas"][0]) / BINS
+    esperado = gaussian_kde(valores)(dados["x"]) * n * largura
+
+    assert len(dados["x"]) == len(dados["kde"])
+    assert dados["x"][np.argmax(dados["kde"])] == pytest.approx(
+        dados["x"][np.argmax(esperado)], abs=2 * largura
+    )
+    assert np.max(np.abs(dados["kde"] - esperado)) <= 0.1 * esperado.max()